@@ -4,6 +4,7 @@ Celery configuration for OreeStats
 import os
 from celery import Celery
 from celery.schedules import crontab
+from kombu import Queue
 
 # Set default Django settings module
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'OreeStats.settings')
@@ -16,23 +17,94 @@ app.config_from_object('django.conf:settings', namespace='CELERY')
 # Auto-discover tasks in all installed apps
 app.autodiscover_tasks()
 
+# Worker/broker tuning for I/O-bound Gmail sends: a gevent pool keeps
+# hundreds of HTTP calls in flight per worker, higher prefetch keeps the
+# pool fed, and late acks make a crashed worker's tasks redeliverable.
+# worker_pool/worker_concurrency here are defaults only - workers MUST
+# also pass `-P gevent` on the CLI, which is the only path that gevent
+# monkey-patches early enough to make sockets cooperative
+app.conf.update(
+    worker_pool='gevent',
+    worker_concurrency=200,
+    worker_prefetch_multiplier=100,
+    task_acks_late=True,
+    task_reject_on_worker_lost=True,
+    task_soft_time_limit=300,
+    broker_pool_limit=50,
+    broker_connection_retry_on_startup=True,
+    broker_transport_options={'visibility_timeout': 5400},
+)
+
+# Heap-preserving beat scheduler (see OreeStats/scheduler.py)
+app.conf.beat_scheduler = 'OreeStats.scheduler:FastScheduler'
+
+# Gmail send shards: sticky lead->mailbox assignment means hashing on
+# lead_id keeps one mailbox's sends serialized within a shard queue
+# while different mailboxes run in parallel across shards
+GMAIL_SEND_SHARDS = int(os.getenv('GMAIL_SEND_SHARDS', '4'))
+
+# Queues: periodic ticks are harmless to re-run after a broker restart,
+# so they go through a transient (non-durable) queue and skip broker
+# persistence; everything else stays on the durable default queue.
+app.conf.task_queues = (
+    Queue('default', durable=True),
+    Queue('periodic', durable=False, queue_arguments={'x-message-ttl': 120000}),
+) + tuple(
+    Queue(f'gmail-{i}', durable=True) for i in range(GMAIL_SEND_SHARDS)
+) + tuple(
+    Queue(f'gmail-poll-{i}', durable=True) for i in range(GMAIL_SEND_SHARDS)
+)
+app.conf.task_default_queue = 'default'
+
+# Non-persistent delivery for the beat ticks below (skips broker fsync)
+_PERIODIC = {'queue': 'periodic', 'delivery_mode': 1}
+
 # Periodic task schedule
 app.conf.beat_schedule = {
     'process-email-queue-every-minute': {
         'task': 'email_service.tasks.process_email_queue',
         'schedule': 60.0,  # Every 60 seconds
+        'options': _PERIODIC,
+    },
+    'refresh-client-daily-stats-every-5-minutes': {
+        'task': 'email_service.tasks.refresh_client_daily_stats',
+        'schedule': 300.0,  # Every 5 minutes
+        'options': _PERIODIC,
+    },
+    'refresh-client-stats-mvs-every-5-minutes': {
+        'task': 'email_service.tasks.refresh_client_stats_mvs',
+        'schedule': 300.0,  # Every 5 minutes
+        'options': _PERIODIC,
+    },
+    'flush-pixel-events-every-minute': {
+        'task': 'email_service.tasks.flush_pixel_events',
+        'schedule': 60.0,  # Every 60 seconds
+        'options': _PERIODIC,
+    },
+    'flush-reply-metrics-every-5-seconds': {
+        'task': 'email_service.tasks.flush_reply_metrics',
+        'schedule': 5.0,  # Replies must land quickly (sequence cancel)
+        'options': _PERIODIC,
+    },
+    'rehydrate-email-schedule-every-5-minutes': {
+        'task': 'email_service.tasks.rehydrate_email_schedule',
+        'schedule': 300.0,  # Every 5 minutes
+        'options': _PERIODIC,
     },
     'check-for-replies-every-15-minutes': {
         'task': 'email_service.tasks.check_for_replies',
         'schedule': 900.0,  # Every 15 minutes
+        'options': _PERIODIC,
     },
-    'reset-daily-limits-at-midnight': {
-        'task': 'email_service.tasks.reset_daily_limits',
+    'reset-mailbox-daily-counts-at-midnight': {
+        'task': 'email_service.tasks.reset_mailbox_daily_counts',
         'schedule': crontab(hour=0, minute=0),  # Daily at midnight UTC
+        'options': _PERIODIC,
     },
     'cleanup-expired-pixels-daily': {
         'task': 'email_service.tasks.cleanup_expired_pixels',
         'schedule': crontab(hour=2, minute=0),  # Daily at 2 AM UTC
+        'options': _PERIODIC,
     },
 }
 
@@ -0,0 +1,84 @@
+"""
+Beat schedulers tuned for cheap ticks and cheap schedule syncs
+"""
+from datetime import timedelta
+
+from celery.beat import PersistentScheduler
+from django.db.models import Q
+from django.utils import timezone
+from django_celery_beat.models import PeriodicTask
+from django_celery_beat.schedulers import DatabaseScheduler
+
+
+class FastScheduler(PersistentScheduler):
+    """
+    PersistentScheduler that rebuilds its heap only when the schedule
+    actually changes.
+
+    The stock Scheduler.tick() deep-compares the whole schedule against a
+    saved copy on every tick to decide whether to re-heapify. For our
+    static beat_schedule that comparison is pure per-tick overhead, so
+    the mutating entry points set an invalidation flag instead and the
+    equality hook simply reports it.
+    """
+
+    def __init__(self, *args, **kwargs):
+        self._heap_invalidated = True
+        super().__init__(*args, **kwargs)
+
+    def setup_schedule(self):
+        super().setup_schedule()
+        self._heap_invalidated = True
+
+    def add(self, **kwargs):
+        entry = super().add(**kwargs)
+        self._heap_invalidated = True
+        return entry
+
+    def update_from_dict(self, dict_):
+        super().update_from_dict(dict_)
+        self._heap_invalidated = True
+
+    def merge_inplace(self, b):
+        super().merge_inplace(b)
+        self._heap_invalidated = True
+
+    def schedules_equal(self, old_schedules, new_schedules):
+        # Called by tick() to decide whether to repopulate the heap.
+        # Trust the explicit flag instead of deep-comparing entries.
+        if self._heap_invalidated:
+            self._heap_invalidated = False
+            return False
+        return True
+
+
+class FilteredDatabaseScheduler(DatabaseScheduler):
+    """
+    DatabaseScheduler that filters obviously-not-due tasks in SQL.
+
+    The stock scheduler materializes every enabled PeriodicTask on each
+    schedule sync. Crontab entries pinned to hours far from now and
+    clocked tasks far in the future can be excluded in the query
+    instead: only crontabs whose hour field could match the current hour
+    (current hour +/- 1 for timezone offsets, plus wildcard/stepped
+    expressions) and clockeds due within the next five minutes are
+    loaded. Use via beat_scheduler when per-tenant schedules move into
+    the database.
+    """
+
+    def enabled_models(self):
+        now = timezone.now()
+        nearby_hours = [str((now.hour + offset) % 24) for offset in (-1, 0, 1)]
+
+        return PeriodicTask.objects.filter(enabled=True).select_related(
+            'interval', 'crontab', 'solar', 'clocked'
+        ).filter(
+            # Plain-number hours must be near now; anything with a
+            # wildcard, list, range or step could match and is kept
+            Q(crontab__isnull=True)
+            | Q(crontab__hour__in=nearby_hours)
+            | Q(crontab__hour__regex=r'[^0-9]')
+        ).filter(
+            Q(clocked__isnull=True)
+            | Q(clocked__clocked_time__lte=now + timedelta(minutes=5))
+        )
@@ -104,6 +104,8 @@ else:
             'PASSWORD': os.getenv('DB_PASSWORD'),
             'HOST': os.getenv('DB_HOST'),
             'PORT': os.getenv('DB_PORT'),
+            'CONN_MAX_AGE': 600,
+            'CONN_HEALTH_CHECKS': True,
         }
     }
 
@@ -129,8 +131,30 @@ else:
             'PASSWORD': aisdr_password,
             'HOST': aisdr_host,
             'PORT': aisdr_port,
+            'CONN_MAX_AGE': 600,
+            'CONN_HEALTH_CHECKS': True,
         }
 
+# The tracking hot path hits the AISDR DB on every open/click; TCP
+# keepalives stop idle persistent connections from being silently
+# dropped by NATs between flushes
+if 'aisdr' in DATABASES:
+    DATABASES['aisdr'].setdefault('OPTIONS', {}).update({
+        'keepalives': 1,
+        'keepalives_idle': 60,
+    })
+
+# Connection pooling: set USE_PGBOUNCER=True when PgBouncer (transaction
+# pooling mode) fronts Postgres. Django must then hand connections back
+# immediately (CONN_MAX_AGE=0 - PgBouncer owns reuse) and avoid
+# server-side cursors, which are per-session state.
+USE_PGBOUNCER = os.getenv('USE_PGBOUNCER', 'False') == 'True'
+if USE_PGBOUNCER:
+    for _db in DATABASES.values():
+        _db['CONN_MAX_AGE'] = 0
+        _db['DISABLE_SERVER_SIDE_CURSORS'] = True
+        _db.setdefault('OPTIONS', {})['application_name'] = 'oreestats'
+
 # Celery
 CELERY_BROKER_URL = os.getenv('CELERY_BROKER_URL')
 CELERY_RESULT_BACKEND = os.getenv('CELERY_RESULT_BACKEND')
@@ -219,6 +243,11 @@ GMAIL_SCOPES = os.getenv('GMAIL_SCOPES', '').split(',')
 # Email Tracking
 TRACKING_DOMAIN = os.getenv('TRACKING_DOMAIN', 'localhost:8000')
 TRACKING_PROTOCOL = os.getenv('TRACKING_PROTOCOL', 'http')
+EMAIL_EVENTS_BULK_BATCH_SIZE = int(os.getenv('EMAIL_EVENTS_BULK_BATCH_SIZE', '500'))
+EMAIL_QUEUE_BULK_BATCH_SIZE = int(os.getenv('EMAIL_QUEUE_BULK_BATCH_SIZE', '500'))
+# Redis mirror of the send schedule (sorted set); defaults to the
+# Celery broker so no extra infrastructure is needed
+EMAIL_SCHED_REDIS_URL = os.getenv('EMAIL_SCHED_REDIS_URL', os.getenv('CELERY_BROKER_URL'))
 
 # API Keys
 OREE_API_KEY = os.getenv('OREE_API_KEY')
@@ -247,6 +276,17 @@ if not DEBUG:
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
 
+# Argon2id first: new/updated client passwords use the memory-hard
+# hasher; the rest of the chain keeps verifying legacy PBKDF2/bcrypt
+# records, which client_login transparently re-hashes on success
+PASSWORD_HASHERS = [
+    "email_service.hashers.ClientArgon2PasswordHasher",
+    "django.contrib.auth.hashers.PBKDF2PasswordHasher",
+    "django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher",
+    "django.contrib.auth.hashers.BCryptSHA256PasswordHasher",
+    "django.contrib.auth.hashers.ScryptPasswordHasher",
+]
+
 AUTH_PASSWORD_VALIDATORS = [
     {
         "NAME": "django.contrib.auth.password_validation.UserAttributeSimilarityValidator",
@@ -6,7 +6,7 @@ Run: python create_client_account.py
 import os
 import sys
 import django
-import uuid
+import uuid_utils
 from pathlib import Path
 
 # Setup Django
@@ -15,10 +15,53 @@ sys.path.append(str(BASE_DIR))
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'OreeStats.settings')
 django.setup()
 
-from django.contrib.auth.hashers import make_password
+from django.contrib.auth.hashers import get_hasher
 import psycopg2
+from psycopg2 import pool
 from django.conf import settings
 
+# Shared connection pool so repeated calls (or importing services) reuse
+# warm connections instead of paying the TCP+auth handshake per query.
+# Built lazily on first use from DATABASES['default'] (the settings
+# module has no DB_* attributes) so importing the helpers - or running
+# `list` - never opens a connection it doesn't need.
+_PG_POOL = None
+
+
+def _get_pool():
+    global _PG_POOL
+    if _PG_POOL is None:
+        db = settings.DATABASES['default']
+        _PG_POOL = pool.ThreadedConnectionPool(
+            1, 8,
+            dbname=db['NAME'],
+            user=db['USER'],
+            password=db['PASSWORD'],
+            host=db['HOST'],
+            port=db['PORT']
+        )
+    return _PG_POOL
+
+
+# Resolve the password hasher once so each account creation skips the
+# per-call hasher lookup/settings resolution inside make_password()
+_PASSWORD_HASHER = get_hasher('default')
+
+
+def hash_password(password):
+    """Hash a password using the cached default hasher"""
+    return _PASSWORD_HASHER.encode(password, _PASSWORD_HASHER.salt())
+
+
+def get_pooled_connection():
+    """Get a connection from the shared pool"""
+    return _get_pool().getconn()
+
+
+def release_pooled_connection(conn):
+    """Return a connection to the shared pool"""
+    _get_pool().putconn(conn)
+
 
 def create_client_account():
     """
@@ -55,32 +98,21 @@ def create_client_account():
     print("Creating account...")
     print("-"*60 + "\n")
     
+    conn = None
     try:
-        # Connect to AISDR database
-        conn = psycopg2.connect(
-            dbname=settings.DB_NAME,
-            user=settings.DB_USER,
-            password=settings.DB_PASSWORD,
-            host=settings.DB_HOST,
-            port=settings.DB_PORT
-        )
+        # Get pooled connection to AISDR database
+        conn = get_pooled_connection()
         cursor = conn.cursor()
-        
-        # Check if email already exists
-        cursor.execute("SELECT id FROM clients WHERE email = %s", (email,))
-        if cursor.fetchone():
-            print(f"❌ Email {email} already exists!")
-            cursor.close()
-            conn.close()
-            return
-        
-        # Generate client ID
-        client_id = str(uuid.uuid4())
-        
+
+        # Generate client ID (time-ordered UUIDv7 so inserts append to the
+        # tail of the clients(id) B-tree instead of scattering randomly)
+        client_id = str(uuid_utils.uuid7())
+
         # Hash password
-        password_hash = make_password(password)
-        
-        # Insert client
+        password_hash = hash_password(password)
+
+        # Insert client; ON CONFLICT makes the duplicate-email check
+        # atomic and saves the separate SELECT round-trip
         cursor.execute("""
             INSERT INTO clients (
                 id,
@@ -92,6 +124,7 @@ def create_client_account():
                 dashboard_enabled,
                 created_at
             ) VALUES (%s, %s, %s, %s, %s, %s, %s, NOW())
+            ON CONFLICT (email) DO NOTHING
             RETURNING id
         """, (
             client_id,
@@ -102,11 +135,16 @@ def create_client_account():
             'active',
             True
         ))
-        
+
+        if cursor.fetchone() is None:
+            print(f"❌ Email {email} already exists!")
+            conn.rollback()
+            cursor.close()
+            return
+
         conn.commit()
         cursor.close()
-        conn.close()
-        
+
         print("✅ Client account created successfully!\n")
         print("="*60)
         print("CLIENT CREDENTIALS")
@@ -156,49 +194,58 @@ Momentum Outbound Team
         print(f"❌ Error creating client: {e}")
         import traceback
         traceback.print_exc()
+    finally:
+        if conn is not None:
+            release_pooled_connection(conn)
 
 
 def list_clients():
     """List all existing clients"""
+    conn = None
     try:
-        conn = psycopg2.connect(
-            dbname=settings.DB_NAME,
-            user=settings.DB_USER,
-            password=settings.DB_PASSWORD,
-            host=settings.DB_HOST,
-            port=settings.DB_PORT
-        )
-        cursor = conn.cursor()
-        
+        conn = get_pooled_connection()
+        # Server-side named cursor streams rows in batches instead of
+        # materializing the full client table in memory
+        cursor = conn.cursor(name='list_clients_cur')
+        cursor.itersize = 500
+
+        # Truncate display columns in SQL so we only transfer the bytes we print
         cursor.execute("""
-            SELECT id, company_name, email, tier, status, dashboard_enabled
+            SELECT SUBSTRING(id::text, 1, 36),
+                   LEFT(company_name, 24),
+                   LEFT(email, 29),
+                   COALESCE(tier, 'N/A'),
+                   status,
+                   dashboard_enabled
             FROM clients
             ORDER BY created_at DESC
         """)
-        
-        clients = cursor.fetchall()
-        cursor.close()
-        conn.close()
-        
+
         print("\n" + "="*80)
         print("EXISTING CLIENTS")
         print("="*80)
-        
-        if not clients:
+
+        lines = [
+            f"{client_id:<40} {company:<25} {email:<30} {tier:<12} {status:<10} {'✅ Yes' if dashboard else '❌ No':<10}"
+            for client_id, company, email, tier, status, dashboard in cursor
+        ]
+        cursor.close()
+
+        if not lines:
             print("\nNo clients found.")
         else:
-            print(f"\nTotal: {len(clients)} clients\n")
+            print(f"\nTotal: {len(lines)} clients\n")
             print(f"{'ID':<40} {'Company':<25} {'Email':<30} {'Tier':<12} {'Status':<10} {'Dashboard':<10}")
             print("-"*80)
-            for client in clients:
-                client_id, company, email, tier, status, dashboard = client
-                dashboard_status = "✅ Yes" if dashboard else "❌ No"
-                print(f"{client_id[:36]:<40} {company[:24]:<25} {email[:29]:<30} {tier or 'N/A':<12} {status:<10} {dashboard_status:<10}")
-        
+            print("\n".join(lines))
+
         print("\n" + "="*80 + "\n")
         
     except Exception as e:
         print(f"❌ Error listing clients: {e}")
+    finally:
+        if conn is not None:
+            release_pooled_connection(conn)
 
 
 if __name__ == '__main__':
@@ -1,4 +1,5 @@
 from django.contrib import admin
+from django.db.models.functions import Length, Substr
 from .models import (
     EmailEvent,
     EmailTrackingPixel,
@@ -31,9 +32,18 @@ class EmailClickTrackingAdmin(admin.ModelAdmin):
     list_filter = ('created_at',)
     search_fields = ('click_id', 'lead_id', 'destination_url')
     readonly_fields = ('id', 'created_at')
-    
+
+    def get_queryset(self, request):
+        # Truncate in SQL so the changelist doesn't transfer full URLs
+        # just to slice them in Python
+        return super().get_queryset(request).annotate(
+            _destination_url_short=Substr('destination_url', 1, 50),
+            _destination_url_length=Length('destination_url')
+        )
+
     def destination_url_short(self, obj):
-        return obj.destination_url[:50] + '...' if len(obj.destination_url) > 50 else obj.destination_url
+        suffix = '...' if obj._destination_url_length > 50 else ''
+        return obj._destination_url_short + suffix
     destination_url_short.short_description = 'Destination URL'
 
 
@@ -55,13 +65,18 @@ class EmailSendQueueAdmin(admin.ModelAdmin):
     search_fields = ('lead_id', 'client_id', 'email_subject')
     ordering = ('scheduled_for',)
     readonly_fields = ('id', 'created_at', 'updated_at', 'sent_at')
-    
+
+    def get_queryset(self, request):
+        # The changelist doesn't show email bodies (they live in
+        # email_queue_bodies); defer the remaining text column too
+        return super().get_queryset(request).defer('email_cta')
+
     fieldsets = (
         ('Basic Info', {
             'fields': ('id', 'lead_id', 'client_id', 'sequence_number')
         }),
         ('Email Content', {
-            'fields': ('email_subject', 'email_body', 'email_cta')
+            'fields': ('email_subject', 'email_cta')
         }),
         ('Scheduling', {
             'fields': ('scheduled_for', 'send_delay_days', 'status')
@@ -0,0 +1,161 @@
+"""
+Write-behind ingestion buffers
+Collapse per-request single-row INSERTs into periodic bulk writes
+"""
+import atexit
+import threading
+import time
+from collections import deque
+from django.conf import settings
+from django.db import transaction
+from .models import EmailEvent, EmailSendQueue, EmailSendQueueBody
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class _WriteBehindBuffer:
+    """
+    Thread-safe buffer that batches items into periodic bulk writes
+
+    Callers append an item and return immediately. The buffer is
+    flushed inline once it reaches the batch size, and a daemon thread
+    flushes whatever is pending every flush_interval seconds so
+    low-traffic periods still land promptly. An atexit hook drains the
+    remainder on clean shutdown. Subclasses implement _write(batch).
+    """
+
+    def __init__(self, batch_size, flush_interval, name):
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.name = name
+        self._buffer = deque()
+        self._lock = threading.Lock()
+        self._flusher_started = False
+
+    def add(self, item):
+        """Queue one item for the next flush"""
+        self._ensure_flusher()
+
+        with self._lock:
+            self._buffer.append(item)
+            full = len(self._buffer) >= self.batch_size
+
+        if full:
+            self.flush()
+
+    def flush(self):
+        """Write all buffered items in one bulk operation"""
+        with self._lock:
+            if not self._buffer:
+                return 0
+            batch = list(self._buffer)
+            self._buffer.clear()
+
+        try:
+            self._write(batch)
+        except Exception as e:
+            logger.error(f"Error flushing {len(batch)} buffered items ({self.name}): {e}")
+            return 0
+
+        return len(batch)
+
+    def _write(self, batch):
+        raise NotImplementedError
+
+    def _ensure_flusher(self):
+        """Start the periodic flush thread on first use"""
+        if self._flusher_started:
+            return
+        with self._lock:
+            if self._flusher_started:
+                return
+            thread = threading.Thread(
+                target=self._flush_loop,
+                name=self.name,
+                daemon=True
+            )
+            thread.start()
+            # Drain whatever is still buffered on clean shutdown so a
+            # SIGTERM between flushes doesn't drop tail items
+            atexit.register(self.flush)
+            self._flusher_started = True
+
+    def _flush_loop(self):
+        while True:
+            time.sleep(self.flush_interval)
+            try:
+                self.flush()
+            except Exception as e:
+                logger.error(f"Flusher error ({self.name}): {e}")
+
+
+class EventBatcher(_WriteBehindBuffer):
+    """
+    Buffers unsaved EmailEvent rows and flushes them with one
+    bulk_create
+
+    Tracking handlers append an unsaved EmailEvent and return; N
+    single-row INSERT transactions collapse into one multi-row INSERT.
+    """
+
+    def __init__(self, batch_size=None, flush_interval=0.2):
+        super().__init__(
+            batch_size or getattr(settings, 'EMAIL_EVENTS_BULK_BATCH_SIZE', 500),
+            flush_interval,
+            'email-event-flusher'
+        )
+
+    def _write(self, batch):
+        # One transaction for the whole flush: a batch larger than
+        # batch_size still commits once instead of per chunk
+        with transaction.atomic():
+            EmailEvent.objects.bulk_create(
+                batch,
+                batch_size=self.batch_size,
+                ignore_conflicts=True
+            )
+
+
+class QueueRowBatcher(_WriteBehindBuffer):
+    """
+    Buffers (EmailSendQueue row, body html) pairs from single-email
+    POSTs and flushes them with one bulk_create per table
+
+    The API already bulk-inserts array payloads; this gives bursts of
+    single-email calls the same collapse. queue ids are generated
+    client-side (UUID default), so the caller can return queue_id
+    before the row is durable - the dispatcher only sees the row after
+    the next flush, well within its 60s tick.
+    """
+
+    def __init__(self, batch_size=None, flush_interval=0.5):
+        super().__init__(
+            batch_size or getattr(settings, 'EMAIL_QUEUE_BULK_BATCH_SIZE', 500),
+            flush_interval,
+            'email-queue-flusher'
+        )
+
+    def _write(self, batch):
+        from .utils import schedule_queue_ids
+
+        rows = [row for row, _ in batch]
+        with transaction.atomic():
+            EmailSendQueue.objects.bulk_create(
+                rows, batch_size=self.batch_size, ignore_conflicts=True
+            )
+            EmailSendQueueBody.objects.bulk_create(
+                [
+                    EmailSendQueueBody(queue_id=row.pk, email_body=body_html)
+                    for row, body_html in batch
+                ],
+                batch_size=self.batch_size,
+                ignore_conflicts=True
+            )
+        # Mirror into the Redis schedule zset (best-effort)
+        schedule_queue_ids((row.pk, row.scheduled_for) for row in rows)
+
+
+# Shared batchers used by the tracking handlers and the send API
+event_batcher = EventBatcher()
+queue_batcher = QueueRowBatcher()
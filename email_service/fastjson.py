@@ -0,0 +1,28 @@
+"""
+Fast JSON responses for high-cardinality list endpoints
+orjson's C encoders handle UUID/datetime natively, skipping DRF's
+per-field to_representation walk on hot read paths.
+"""
+import orjson
+from django.http import HttpResponse
+
+# Naive datetimes are UTC throughout the project (USE_TZ + UTC)
+_OPTS = orjson.OPT_NAIVE_UTC
+
+
+def fast_json_response(data, status=200):
+    """
+    Serialize a payload of dicts/lists straight to an HttpResponse
+
+    Args:
+        data: JSON-serializable payload (.values() rows, dicts, lists)
+        status: HTTP status code
+
+    Returns:
+        HttpResponse with application/json content
+    """
+    return HttpResponse(
+        orjson.dumps(data, default=str, option=_OPTS),
+        content_type='application/json',
+        status=status
+    )
@@ -2,9 +2,21 @@
 Gmail API Client Wrapper
 Handles OAuth2 authentication and email sending via Gmail API
 """
+import asyncio
 import base64
-from email.mime.text import MIMEText
-from email.mime.multipart import MIMEMultipart
+import functools
+import hashlib
+import re
+import threading
+from collections import deque
+from email.header import Header
+from weakref import WeakValueDictionary
+
+from cachetools import TTLCache
+
+import httpx
+import httplib2
+import google_auth_httplib2
 from google.oauth2.credentials import Credentials
 from google.auth.transport.requests import Request
 from googleapiclient.discovery import build
@@ -15,6 +27,18 @@ import logging
 
 logger = logging.getLogger(__name__)
 
+# Built Gmail services shared across GmailClient instances for the same
+# mailbox (keyed by hashed refresh token). Weak values let idle entries
+# drop once no client references them.
+_SERVICE_CACHE = WeakValueDictionary()
+
+# GmailClient instances memoized per GmailToken id so a batch where one
+# mailbox sends many emails reuses a single client (credentials, HTTP
+# connection, service tree) instead of rebuilding it per email. Token
+# row writes evict entries via the GmailToken post_save signal.
+_CLIENT_CACHE = TTLCache(maxsize=256, ttl=1800)
+_CLIENT_CACHE_LOCK = threading.Lock()
+
 
 class GmailClient:
     """
@@ -28,17 +52,21 @@ class GmailClient:
         'https://www.googleapis.com/auth/gmail.modify'
     ]
     
-    def __init__(self, access_token, refresh_token, token_expiry, client_id=None):
+    def __init__(self, access_token, refresh_token, token_expiry, client_id=None,
+                 email_address=None):
         """
         Initialize Gmail client with OAuth2 credentials
-        
+
         Args:
             access_token: OAuth2 access token
             refresh_token: OAuth2 refresh token
             token_expiry: Token expiration datetime
             client_id: Optional client ID for logging
+            email_address: Mailbox email address, if already known
+                (avoids a getProfile API call per reply check)
         """
         self.client_id = client_id
+        self.email_address = email_address
         self.credentials = Credentials(
             token=access_token,
             refresh_token=refresh_token,
@@ -56,9 +84,61 @@ class GmailClient:
             except Exception as e:
                 logger.error(f"Failed to refresh token for client {client_id}: {e}")
                 raise
-        
-        self.service = build('gmail', 'v1', credentials=self.credentials)
-    
+
+    @functools.cached_property
+    def service(self):
+        """
+        Gmail API service, built lazily on first use
+
+        Parsing the discovery document and building the resource tree is
+        expensive, so callers that only need credentials (e.g. token
+        refresh in the factory) never pay for it. static_discovery uses
+        the bundled discovery document instead of an HTTP fetch.
+
+        An explicit AuthorizedHttp is shared across all calls on this
+        instance so back-to-back sends reuse the same TLS connection
+        instead of handshaking per request.
+
+        Built services are additionally memoized per refresh token, so
+        repeated factory calls for the same mailbox share one resource
+        tree instead of re-parsing the discovery document each time.
+        """
+        cache_key = None
+        if self.credentials.refresh_token:
+            cache_key = hashlib.sha1(
+                self.credentials.refresh_token.encode()
+            ).hexdigest()
+            service = _SERVICE_CACHE.get(cache_key)
+            if service is not None:
+                return service
+
+        authed_http = google_auth_httplib2.AuthorizedHttp(
+            self.credentials,
+            http=httplib2.Http(timeout=60)
+        )
+        service = build(
+            'gmail', 'v1',
+            http=authed_http,
+            cache_discovery=False,
+            static_discovery=True
+        )
+        if cache_key is not None:
+            _SERVICE_CACHE[cache_key] = service
+        return service
+
+    @functools.cached_property
+    def _our_email(self):
+        """
+        Our own email address, lowercased, for filtering out sent messages
+
+        Uses the address passed at construction when available; falls back
+        to a single getProfile call cached for the instance lifetime.
+        """
+        if self.email_address:
+            return self.email_address.lower()
+        profile = self.get_profile()
+        return (profile.get('emailAddress') or '').lower() if profile else None
+
     def get_updated_credentials(self):
         """
         Get updated credentials after potential refresh
@@ -87,31 +167,13 @@ class GmailClient:
             Gmail message ID if successful, None otherwise
         """
         try:
-            # Create MIME message
-            message = MIMEMultipart('alternative')
-            message['To'] = to_email
-            message['Subject'] = subject
-            
-            if from_name:
-                message['From'] = from_name
-            
-            # Replace links with tracking URLs
-            if tracked_links:
-                for original_url, tracking_url in tracked_links.items():
-                    body_html = body_html.replace(original_url, tracking_url)
-            
-            # Add tracking pixel to body
-            if tracking_pixel_url:
-                pixel_html = f'<img src="{tracking_pixel_url}" width="1" height="1" style="display:none;" alt="" />'
-                body_html += pixel_html
-            
-            # Attach HTML body
-            html_part = MIMEText(body_html, 'html')
-            message.attach(html_part)
-            
-            # Encode message
-            raw_message = base64.urlsafe_b64encode(message.as_bytes()).decode('utf-8')
-            
+            raw_message = build_raw_message(
+                to_email, subject, body_html,
+                tracking_pixel_url=tracking_pixel_url,
+                tracked_links=tracked_links,
+                from_name=from_name
+            )
+
             # Send via Gmail API
             send_result = self.service.users().messages().send(
                 userId='me',
@@ -165,33 +227,100 @@ class GmailClient:
             logger.error(f'Error retrieving message {message_id}: {error}')
             return None
     
-    def list_history(self, start_history_id, max_results=100):
+    def get_messages_batch(self, message_ids, format='full'):
         """
-        List history changes (for reply detection)
-        
+        Retrieve many messages via Gmail's batch HTTP endpoint
+
+        Multiplexes up to 100 users.messages.get sub-requests into one
+        HTTPS round-trip instead of a request per message; the savings
+        are almost entirely TLS/HTTP RTT.
+
+        Args:
+            message_ids: Iterable of Gmail message IDs
+            format: Message format ('full', 'minimal', 'raw', 'metadata')
+
+        Returns:
+            List of message objects (failed sub-requests are skipped)
+        """
+        message_ids = list(message_ids)
+        messages = []
+
+        def _collect(request_id, response, exception):
+            if exception is not None:
+                logger.error(f'Error retrieving message in batch: {exception}')
+            elif response:
+                messages.append(response)
+
+        # Gmail caps a batch request at 100 sub-requests
+        for i in range(0, len(message_ids), 100):
+            batch = self.service.new_batch_http_request()
+            for message_id in message_ids[i:i + 100]:
+                batch.add(
+                    self.service.users().messages().get(
+                        userId='me',
+                        id=message_id,
+                        format=format
+                    ),
+                    callback=_collect
+                )
+            try:
+                batch.execute()
+            except HttpError as error:
+                logger.error(f'Batch message fetch failed: {error}')
+
+        return messages
+
+    def iter_history_pages(self, start_history_id, page_size=100):
+        """
+        Yield history changes lazily, one page at a time
+
+        Generator over (records, advanced history id) tuples following
+        Gmail's nextPageToken, so memory stays flat no matter how much
+        history accumulated and callers can process a page (e.g. batch
+        message fetch) while deciding whether to pull the next one.
+        An advanced id of None means start_history_id has expired
+        (HTTP 404) and the caller must re-baseline from getProfile.
+
         Args:
             start_history_id: History ID to start from
-            max_results: Maximum number of results to return
-        
+            page_size: Records per page request
+        """
+        page_token = None
+        while True:
+            try:
+                response = self.service.users().history().list(
+                    userId='me',
+                    startHistoryId=start_history_id,
+                    maxResults=page_size,
+                    historyTypes=['messageAdded'],
+                    pageToken=page_token
+                ).execute()
+            except HttpError as error:
+                # historyId not found: cursor too old or brand-new account
+                if error.resp.status == 404:
+                    logger.debug(f'History ID {start_history_id} not found, re-baseline needed')
+                    yield [], None
+                    return
+                logger.error(f'Error listing history: {error}')
+                # Transient failure: keep the cursor where it was
+                yield [], start_history_id
+                return
+
+            yield response.get('history', []), response.get('historyId')
+
+            page_token = response.get('nextPageToken')
+            if not page_token:
+                return
+
+    def list_history(self, start_history_id, max_results=100):
+        """
+        List history changes (single page; see iter_history_pages)
+
         Returns:
-            List of history records
+            Tuple of (history records, advanced history id); the id is
+            None when start_history_id has expired.
         """
-        try:
-            history = self.service.users().history().list(
-                userId='me',
-                startHistoryId=start_history_id,
-                maxResults=max_results,
-                historyTypes=['messageAdded']
-            ).execute()
-            
-            return history.get('history', [])
-        except HttpError as error:
-            # historyId not found error is common and expected
-            if error.resp.status == 404:
-                logger.debug(f'History ID {start_history_id} not found (expected for new accounts)')
-                return []
-            logger.error(f'Error listing history: {error}')
-            return []
+        return next(self.iter_history_pages(start_history_id, max_results))
     
     def get_profile(self):
         """
@@ -250,28 +379,75 @@ class GmailClient:
                 id=thread_id
             ).execute()
             
-            messages = thread.get('messages', [])
-            
-            # Get our email address
-            profile = self.get_profile()
-            our_email = profile.get('emailAddress') if profile else None
-            
-            # Filter for replies (messages not from us)
-            replies = []
-            for msg in messages:
-                headers = msg.get('payload', {}).get('headers', [])
-                from_header = next((h['value'] for h in headers if h['name'].lower() == 'from'), '')
-                
-                # Check if message is not from us
-                if our_email and our_email.lower() not in from_header.lower():
-                    replies.append(msg)
-            
-            return replies
-            
+            return self._filter_replies(thread.get('messages', []))
+
         except HttpError as error:
             logger.error(f'Error checking for replies in thread {thread_id}: {error}')
             return []
-    
+
+    def check_for_replies_bulk(self, thread_ids):
+        """
+        Check multiple threads for replies using batched HTTP requests
+
+        Packs thread gets into Gmail batch requests (100 per batch) so N
+        threads cost ceil(N/100) round-trips instead of N.
+
+        Args:
+            thread_ids: List of Gmail thread IDs
+
+        Returns:
+            Dict mapping thread_id to list of reply messages
+        """
+        threads = {}
+
+        def _collect(request_id, response, exception):
+            if exception is not None:
+                logger.error(f'Error fetching thread {request_id} in batch: {exception}')
+            else:
+                threads[request_id] = response
+
+        for start in range(0, len(thread_ids), 100):
+            batch = self.service.new_batch_http_request()
+            for thread_id in thread_ids[start:start + 100]:
+                batch.add(
+                    self.service.users().threads().get(userId='me', id=thread_id),
+                    request_id=thread_id,
+                    callback=_collect
+                )
+            try:
+                batch.execute()
+            except HttpError as error:
+                logger.error(f'Gmail batch error checking for replies: {error}')
+
+        return {
+            thread_id: self._filter_replies(threads.get(thread_id, {}).get('messages', []))
+            for thread_id in thread_ids
+        }
+
+    def _filter_replies(self, messages):
+        """
+        Filter a thread's messages down to replies (messages not from us)
+
+        Args:
+            messages: List of Gmail message objects
+
+        Returns:
+            List of reply messages
+        """
+        our_email = self._our_email
+
+        replies = []
+        for msg in messages:
+            headers = msg.get('payload', {}).get('headers', [])
+            from_header = next((h['value'] for h in headers if h['name'].lower() == 'from'), '')
+
+            # Check if message is not from us
+            if our_email and our_email not in from_header.lower():
+                replies.append(msg)
+
+        return replies
+
+
     def get_message_snippet(self, message_id):
         """
         Get a short snippet of a message (useful for reply preview)
@@ -304,19 +480,39 @@ class GmailClientFactory:
     def from_gmail_token(gmail_token):
         """
         Create GmailClient from GmailToken model instance
-        
+
+        Instances are memoized per token id (30 min TTL) so callers in a
+        hot loop don't pay for Credentials construction and a possible
+        token refresh on every email.
+
         Args:
             gmail_token: GmailToken model instance
-        
+
         Returns:
             GmailClient instance
         """
-        return GmailClient(
+        key = str(gmail_token.id)
+        with _CLIENT_CACHE_LOCK:
+            client = _CLIENT_CACHE.get(key)
+        if client is not None:
+            return client
+
+        client = GmailClient(
             access_token=gmail_token.access_token,
             refresh_token=gmail_token.refresh_token,
             token_expiry=gmail_token.token_expiry,
-            client_id=str(gmail_token.client_id)
+            client_id=str(gmail_token.client_id),
+            email_address=gmail_token.email_address
         )
+        with _CLIENT_CACHE_LOCK:
+            _CLIENT_CACHE[key] = client
+        return client
+
+    @staticmethod
+    def evict(token_id):
+        """Drop the memoized client for a token (called on token writes)"""
+        with _CLIENT_CACHE_LOCK:
+            _CLIENT_CACHE.pop(str(token_id), None)
     
     @staticmethod
     def from_client_id(client_id):
@@ -336,20 +532,27 @@ class GmailClientFactory:
                 client_id=client_id,
                 status='active'
             )
-            
+
             client = GmailClientFactory.from_gmail_token(gmail_token)
-            
-            # Update last_used_at
-            gmail_token.last_used_at = timezone.now()
-            
-            # Update token if it was refreshed
+
+            now = timezone.now()
+            updates = {}
+
+            # Persist credentials only when the token was actually refreshed
             updated_creds = client.get_updated_credentials()
             if updated_creds['access_token'] != gmail_token.access_token:
-                gmail_token.access_token = updated_creds['access_token']
-                gmail_token.token_expiry = updated_creds['token_expiry']
-            
-            gmail_token.save()
-            
+                updates['access_token'] = updated_creds['access_token']
+                updates['token_expiry'] = updated_creds['token_expiry']
+
+            # Debounce last_used_at to one write per minute per token so
+            # hot send loops don't issue an UPDATE per Gmail operation
+            if (gmail_token.last_used_at is None
+                    or (now - gmail_token.last_used_at).total_seconds() > 60):
+                updates['last_used_at'] = now
+
+            if updates:
+                GmailToken.objects.filter(pk=gmail_token.pk).update(**updates)
+
             return client
             
         except GmailToken.DoesNotExist:
@@ -360,59 +563,224 @@ class GmailClientFactory:
             return None
 
 
+class AsyncGmailClient:
+    """
+    Async wrapper for concurrent Gmail sends
+
+    Posts directly to the Gmail REST send endpoint with httpx so a batch
+    of I/O-bound sends overlaps in one event loop instead of paying one
+    serial round-trip per message. Token refresh is handled by the
+    wrapped GmailClient before the batch starts.
+    """
+
+    SEND_URL = 'https://gmail.googleapis.com/gmail/v1/users/me/messages/send'
+
+    def __init__(self, gmail_client):
+        """
+        Args:
+            gmail_client: GmailClient instance with valid credentials
+        """
+        self._client = gmail_client
+
+    async def send_email(self, session, to_email, subject, body_html,
+                         tracking_pixel_url=None, tracked_links=None, from_name=None):
+        """
+        Send a single email on a shared httpx session
+
+        Args:
+            session: httpx.AsyncClient to send on
+            (remaining args as GmailClient.send_email)
+
+        Returns:
+            Same result dict shape as GmailClient.send_email
+        """
+        raw_message = build_raw_message(
+            to_email, subject, body_html,
+            tracking_pixel_url=tracking_pixel_url,
+            tracked_links=tracked_links,
+            from_name=from_name
+        )
+
+        try:
+            response = await session.post(
+                self.SEND_URL,
+                json={'raw': raw_message},
+                headers={'Authorization': f'Bearer {self._client.credentials.token}'}
+            )
+            response.raise_for_status()
+            result = response.json()
+
+            return {
+                'message_id': result.get('id'),
+                'thread_id': result.get('threadId'),
+                'success': True
+            }
+        except httpx.HTTPStatusError as error:
+            logger.error(f'Gmail API error sending email: {error}')
+            return {
+                'success': False,
+                'error': str(error),
+                'error_code': error.response.status_code
+            }
+        except Exception as error:
+            logger.error(f'Unexpected error sending email: {error}')
+            return {
+                'success': False,
+                'error': str(error)
+            }
+
+    async def send_many(self, messages):
+        """
+        Send a batch of emails concurrently
+
+        Args:
+            messages: List of dicts of send_email keyword arguments
+
+        Returns:
+            List of result dicts, in input order
+        """
+        async with httpx.AsyncClient(timeout=60) as session:
+            return await asyncio.gather(*[
+                self.send_email(session, **message) for message in messages
+            ])
+
+    def send_many_blocking(self, messages):
+        """
+        Synchronous entry point for callers without an event loop
+        (e.g. Celery prefork workers)
+        """
+        return asyncio.run(self.send_many(messages))
+
+
 # Utility functions
 
+# Static tracking-pixel template, formatted with %s per send instead of
+# rebuilding the markup in an f-string each call
+_PIXEL_TMPL = '<img src="%s" width="1" height="1" style="display:none;" alt="" />'
+
+# Headers identical for every send, pre-encoded once (includes the blank
+# line separating headers from the base64 body)
+_STATIC_HEADER_BYTES = (
+    b'\r\nMIME-Version: 1.0'
+    b'\r\nContent-Type: text/html; charset="utf-8"'
+    b'\r\nContent-Transfer-Encoding: base64'
+    b'\r\n\r\n'
+)
+
+
+def build_raw_message(to_email, subject, body_html, tracking_pixel_url=None,
+                      tracked_links=None, from_name=None):
+    """
+    Build a base64url-encoded RFC 5322 message for the Gmail API
+
+    There is only ever a single HTML part, so the headers and base64 body
+    are assembled directly instead of running the MIMEMultipart/email
+    generator machinery per send.
+
+    Args:
+        (same as GmailClient.send_email)
+
+    Returns:
+        base64url-encoded message string for the 'raw' send field
+    """
+    # Replace links with tracking URLs in a single pass instead of one
+    # full-body scan+copy per link. Longest URLs first so a link that is
+    # a prefix of another can't shadow it.
+    if tracked_links:
+        pattern = re.compile('|'.join(
+            re.escape(url) for url in sorted(tracked_links, key=len, reverse=True)
+        ))
+        body_html = pattern.sub(lambda m: tracked_links[m.group(0)], body_html)
+
+    # Add tracking pixel to body
+    if tracking_pixel_url:
+        body_html += _PIXEL_TMPL % tracking_pixel_url
+
+    if subject.isascii():
+        encoded_subject = subject
+    else:
+        encoded_subject = Header(subject, 'utf-8').encode()
+
+    header_lines = [f'To: {to_email}']
+    if from_name:
+        header_lines.append(f'From: {from_name}')
+    header_lines.append(f'Subject: {encoded_subject}')
+
+    raw_bytes = (
+        '\r\n'.join(header_lines).encode('utf-8')
+        + _STATIC_HEADER_BYTES
+        + base64.encodebytes(body_html.encode('utf-8'))
+    )
+
+    return base64.urlsafe_b64encode(raw_bytes).decode('utf-8')
+
+
+_WANTED_HEADERS = frozenset({'from', 'to', 'subject', 'date', 'message-id'})
+
+
 def parse_email_headers(message):
     """
     Parse email headers from Gmail message
-    
+
     Args:
         message: Gmail message object
-    
+
     Returns:
         Dict with common headers (from, to, subject, date)
     """
     headers = message.get('payload', {}).get('headers', [])
-    
-    header_dict = {}
-    for header in headers:
-        name = header['name'].lower()
-        if name in ['from', 'to', 'subject', 'date', 'message-id']:
-            header_dict[name] = header['value']
-    
-    return header_dict
+
+    return {
+        name: header['value']
+        for header in headers
+        if (name := header['name'].lower()) in _WANTED_HEADERS
+    }
 
 
 def get_email_body(message):
     """
     Extract email body from Gmail message
-    
+
     Args:
         message: Gmail message object
-    
+
     Returns:
         Email body as text
     """
     try:
-        payload = message.get('payload', {})
-        
-        # Check for multipart message
-        if 'parts' in payload:
-            for part in payload['parts']:
-                if part['mimeType'] == 'text/plain':
-                    data = part['body'].get('data', '')
-                    return base64.urlsafe_b64decode(data).decode('utf-8')
-                elif part['mimeType'] == 'text/html':
-                    data = part['body'].get('data', '')
-                    return base64.urlsafe_b64decode(data).decode('utf-8')
-        else:
-            # Simple message
-            data = payload.get('body', {}).get('data', '')
-            if data:
-                return base64.urlsafe_b64decode(data).decode('utf-8')
-        
+        # Walk (possibly nested) parts iteratively; return the first
+        # text/plain part immediately and keep the first other candidate
+        # as fallback, decoding exactly once
+        html_data = None
+        other_data = None
+
+        parts = deque([message.get('payload', {})])
+        while parts:
+            part = parts.popleft()
+            nested = part.get('parts')
+            if nested:
+                parts.extend(nested)
+                continue
+
+            data = part.get('body', {}).get('data', '')
+            if not data:
+                continue
+
+            mime_type = part.get('mimeType')
+            if mime_type == 'text/plain':
+                return base64.urlsafe_b64decode(data.encode('ascii')).decode('utf-8')
+            if mime_type == 'text/html':
+                if html_data is None:
+                    html_data = data
+            elif other_data is None:
+                other_data = data
+
+        data = html_data or other_data
+        if data:
+            return base64.urlsafe_b64decode(data.encode('ascii')).decode('utf-8')
+
         return message.get('snippet', '')
-        
+
     except Exception as e:
         logger.error(f'Error extracting email body: {e}')
         return message.get('snippet', '')
@@ -0,0 +1,18 @@
+"""
+Password hashing configuration for client dashboard accounts
+"""
+from django.contrib.auth.hashers import Argon2PasswordHasher
+
+
+class ClientArgon2PasswordHasher(Argon2PasswordHasher):
+    """
+    Argon2id tuned per RFC 9106's second recommendation
+
+    64 MiB / 3 passes / 4 lanes lands around ~100ms per verify on the
+    deployment hardware - memory-hard against GPU cracking without
+    letting a burst of logins exhaust worker memory the way the 100 MiB
+    Django default could under gunicorn's 2*cpu+1 processes.
+    """
+    time_cost = 3
+    memory_cost = 64 * 1024
+    parallelism = 4
@@ -0,0 +1,33 @@
+# Generated by Django 5.2.17 on 2026-08-26 16:31
+
+from django.db import migrations, models
+
+
+def vacuum_analyze(apps, schema_editor):
+    """Refresh planner stats after swapping the queue index (PostgreSQL only)"""
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute('ANALYZE email_send_queue')
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("email_service", "0003_emailsendqueue_recipient_email_leadmailboxassignment"),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name="emailsendqueue",
+            name="email_send__status_a7e6d5_idx",
+        ),
+        migrations.AddIndex(
+            model_name="emailsendqueue",
+            index=models.Index(
+                condition=models.Q(("status", "PENDING")),
+                fields=["scheduled_for"],
+                name="esq_pending_sched",
+            ),
+        ),
+        migrations.RunPython(vacuum_analyze, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,41 @@
+# Materialized view backing the client dashboard stats/timeline endpoints
+
+from django.db import migrations
+
+
+def create_matview(apps, schema_editor):
+    """Create mv_client_daily_stats (PostgreSQL only)"""
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute("""
+            CREATE MATERIALIZED VIEW IF NOT EXISTS mv_client_daily_stats AS
+            SELECT client_id,
+                   date_trunc('day', created_at) AS day,
+                   event_type,
+                   count(*) AS cnt
+            FROM email_events
+            GROUP BY 1, 2, 3
+        """)
+        # Unique index required for REFRESH MATERIALIZED VIEW CONCURRENTLY
+        cursor.execute("""
+            CREATE UNIQUE INDEX IF NOT EXISTS mv_client_daily_stats_uq
+            ON mv_client_daily_stats (client_id, day, event_type)
+        """)
+
+
+def drop_matview(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute('DROP MATERIALIZED VIEW IF EXISTS mv_client_daily_stats')
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("email_service", "0004_remove_emailsendqueue_email_send__status_a7e6d5_idx_and_more"),
+    ]
+
+    operations = [
+        migrations.RunPython(create_matview, drop_matview),
+    ]
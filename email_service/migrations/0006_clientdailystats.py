@@ -0,0 +1,25 @@
+# Generated by Django 5.2.17 on 2026-08-26 16:32
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("email_service", "0005_mv_client_daily_stats"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ClientDailyStats",
+            fields=[
+                ("client_id", models.UUIDField(primary_key=True, serialize=False)),
+                ("day", models.DateTimeField()),
+                ("event_type", models.CharField(max_length=10)),
+                ("cnt", models.BigIntegerField()),
+            ],
+            options={
+                "db_table": "mv_client_daily_stats",
+                "managed": False,
+            },
+        ),
+    ]
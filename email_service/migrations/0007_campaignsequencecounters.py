@@ -0,0 +1,45 @@
+# Generated by Django 5.2.17 on 2026-08-26 16:35
+
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("email_service", "0006_clientdailystats"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="CampaignSequenceCounters",
+            fields=[
+                (
+                    "id",
+                    models.UUIDField(
+                        default=uuid.uuid4,
+                        editable=False,
+                        primary_key=True,
+                        serialize=False,
+                    ),
+                ),
+                ("client_id", models.UUIDField(db_index=True)),
+                ("sequence_number", models.IntegerField()),
+                ("sent", models.IntegerField(default=0)),
+                ("opens", models.IntegerField(default=0)),
+                ("clicks", models.IntegerField(default=0)),
+                ("replies", models.IntegerField(default=0)),
+                ("last_sent", models.DateTimeField(blank=True, null=True)),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                "db_table": "campaign_sequence_counters",
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("client_id", "sequence_number"),
+                        name="unique_client_sequence_counters",
+                    )
+                ],
+            },
+        ),
+    ]
@@ -0,0 +1,84 @@
+# Trigger + backfill keeping campaign_sequence_counters in sync with
+# email_events (PostgreSQL only)
+
+from django.db import migrations
+
+
+def create_trigger(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    with schema_editor.connection.cursor() as cursor:
+        # Backfill counters from existing events before the trigger
+        # takes over incremental maintenance
+        cursor.execute("""
+            INSERT INTO campaign_sequence_counters
+                (id, client_id, sequence_number, sent, opens, clicks,
+                 replies, last_sent, created_at, updated_at)
+            SELECT gen_random_uuid(),
+                   client_id,
+                   sequence_number,
+                   count(*) FILTER (WHERE event_type = 'SENT'),
+                   count(*) FILTER (WHERE event_type = 'OPEN'),
+                   count(*) FILTER (WHERE event_type = 'CLICK'),
+                   count(*) FILTER (WHERE event_type = 'REPLY'),
+                   max(created_at) FILTER (WHERE event_type = 'SENT'),
+                   now(), now()
+            FROM email_events
+            WHERE sequence_number IS NOT NULL
+            GROUP BY client_id, sequence_number
+            ON CONFLICT (client_id, sequence_number) DO NOTHING
+        """)
+        cursor.execute("""
+            CREATE OR REPLACE FUNCTION bump_campaign_sequence_counters()
+            RETURNS trigger AS $$
+            BEGIN
+                IF NEW.sequence_number IS NULL THEN
+                    RETURN NEW;
+                END IF;
+                INSERT INTO campaign_sequence_counters
+                    (id, client_id, sequence_number, sent, opens, clicks,
+                     replies, last_sent, created_at, updated_at)
+                VALUES (
+                    gen_random_uuid(), NEW.client_id, NEW.sequence_number,
+                    (NEW.event_type = 'SENT')::int,
+                    (NEW.event_type = 'OPEN')::int,
+                    (NEW.event_type = 'CLICK')::int,
+                    (NEW.event_type = 'REPLY')::int,
+                    CASE WHEN NEW.event_type = 'SENT' THEN NEW.created_at END,
+                    now(), now()
+                )
+                ON CONFLICT (client_id, sequence_number) DO UPDATE SET
+                    sent = campaign_sequence_counters.sent + EXCLUDED.sent,
+                    opens = campaign_sequence_counters.opens + EXCLUDED.opens,
+                    clicks = campaign_sequence_counters.clicks + EXCLUDED.clicks,
+                    replies = campaign_sequence_counters.replies + EXCLUDED.replies,
+                    last_sent = GREATEST(campaign_sequence_counters.last_sent,
+                                         EXCLUDED.last_sent),
+                    updated_at = now();
+                RETURN NEW;
+            END;
+            $$ LANGUAGE plpgsql
+        """)
+        cursor.execute("""
+            CREATE TRIGGER trg_email_events_seq_counters
+            AFTER INSERT ON email_events
+            FOR EACH ROW EXECUTE FUNCTION bump_campaign_sequence_counters()
+        """)
+
+
+def drop_trigger(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute('DROP TRIGGER IF EXISTS trg_email_events_seq_counters ON email_events')
+        cursor.execute('DROP FUNCTION IF EXISTS bump_campaign_sequence_counters()')
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("email_service", "0007_campaignsequencecounters"),
+    ]
+
+    operations = [
+        migrations.RunPython(create_trigger, drop_trigger),
+    ]
@@ -0,0 +1,52 @@
+# Generated by Django 5.2.17 on 2026-08-26 16:39
+
+from django.db import migrations, models
+
+
+def analyze_tables(apps, schema_editor):
+    """Refresh planner stats after the index changes (PostgreSQL only)"""
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute('ANALYZE email_events')
+        cursor.execute('ANALYZE lead_mailbox_assignments')
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("email_service", "0008_campaign_sequence_trigger"),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name="leadmailboxassignment",
+            name="lead_mailbo_lead_id_4a40df_idx",
+        ),
+        migrations.RemoveIndex(
+            model_name="leadmailboxassignment",
+            name="lead_mailbo_client__7fd025_idx",
+        ),
+        migrations.RemoveIndex(
+            model_name="leadmailboxassignment",
+            name="lead_mailbo_status_f319c1_idx",
+        ),
+        migrations.AlterField(
+            model_name="emailevent",
+            name="lead_id",
+            field=models.UUIDField(),
+        ),
+        migrations.AlterField(
+            model_name="leadmailboxassignment",
+            name="lead_id",
+            field=models.UUIDField(help_text="Lead ID from AISDR database"),
+        ),
+        migrations.AddIndex(
+            model_name="leadmailboxassignment",
+            index=models.Index(
+                condition=models.Q(("status", "active")),
+                fields=["status"],
+                name="lma_active_status",
+            ),
+        ),
+        migrations.RunPython(analyze_tables, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,85 @@
+# Generated by Django 5.2.17 on 2026-08-26 16:42
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def copy_bodies(apps, schema_editor):
+    """Move existing body text into the new sibling tables"""
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute("""
+            INSERT INTO email_event_bodies (event_id, reply_content, reply_snippet)
+            SELECT id, reply_content, reply_snippet
+            FROM email_events
+            WHERE reply_content IS NOT NULL OR reply_snippet IS NOT NULL
+        """)
+        cursor.execute("""
+            INSERT INTO email_queue_bodies (queue_id, email_body)
+            SELECT id, email_body FROM email_send_queue
+        """)
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        (
+            "email_service",
+            "0009_remove_leadmailboxassignment_lead_mailbo_lead_id_4a40df_idx_and_more",
+        ),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="EmailEventBody",
+            fields=[
+                (
+                    "event",
+                    models.OneToOneField(
+                        db_column="event_id",
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="body",
+                        serialize=False,
+                        to="email_service.emailevent",
+                    ),
+                ),
+                ("reply_content", models.TextField(blank=True, null=True)),
+                ("reply_snippet", models.TextField(blank=True, null=True)),
+            ],
+            options={
+                "db_table": "email_event_bodies",
+            },
+        ),
+        migrations.CreateModel(
+            name="EmailSendQueueBody",
+            fields=[
+                (
+                    "queue",
+                    models.OneToOneField(
+                        db_column="queue_id",
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="body",
+                        serialize=False,
+                        to="email_service.emailsendqueue",
+                    ),
+                ),
+                ("email_body", models.TextField()),
+            ],
+            options={
+                "db_table": "email_queue_bodies",
+            },
+        ),
+        migrations.RunPython(copy_bodies, migrations.RunPython.noop),
+        migrations.RemoveField(
+            model_name="emailevent",
+            name="reply_content",
+        ),
+        migrations.RemoveField(
+            model_name="emailevent",
+            name="reply_snippet",
+        ),
+        migrations.RemoveField(
+            model_name="emailsendqueue",
+            name="email_body",
+        ),
+    ]
@@ -0,0 +1,34 @@
+# Generated by Django 5.2.17 on 2026-08-26 16:45
+
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("email_service", "0010_emaileventbody_emailsendqueuebody_and_more"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="StatsMVRegistry",
+            fields=[
+                (
+                    "id",
+                    models.UUIDField(
+                        default=uuid.uuid4,
+                        editable=False,
+                        primary_key=True,
+                        serialize=False,
+                    ),
+                ),
+                ("client_id", models.UUIDField(unique=True)),
+                ("mv_name", models.CharField(max_length=63, unique=True)),
+                ("last_refreshed", models.DateTimeField(blank=True, null=True)),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                "db_table": "stats_mv_registry",
+            },
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.2.17 on 2026-08-26 16:46
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("email_service", "0011_statsmvregistry"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="emailevent",
+            index=models.Index(
+                fields=["client_id", "created_at", "event_type"],
+                name="email_event_client__143fd3_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,37 @@
+# GIN index + TOAST tuning for EmailEvent.metadata (PostgreSQL only)
+
+from django.db import migrations
+
+
+def add_metadata_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    with schema_editor.connection.cursor() as cursor:
+        # jsonb_path_ops: smaller index, covers containment (@>) filters
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS email_events_metadata_gin
+            ON email_events USING GIN (metadata jsonb_path_ops)
+        """)
+        # Keep large metadata values out-of-line but uncompressed so the
+        # hot tuple stays small and reads skip decompression
+        cursor.execute("""
+            ALTER TABLE email_events
+            ALTER COLUMN metadata SET STORAGE EXTERNAL
+        """)
+
+
+def drop_metadata_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute('DROP INDEX IF EXISTS email_events_metadata_gin')
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("email_service", "0012_emailevent_email_event_client__143fd3_idx"),
+    ]
+
+    operations = [
+        migrations.RunPython(add_metadata_index, drop_metadata_index),
+    ]
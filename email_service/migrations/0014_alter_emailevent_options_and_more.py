@@ -0,0 +1,20 @@
+# Generated by Django 5.2.17 on 2026-08-26 16:47
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("email_service", "0013_email_events_metadata_gin"),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name="emailevent",
+            options={},
+        ),
+        migrations.AlterModelOptions(
+            name="emailsendqueue",
+            options={},
+        ),
+    ]
@@ -0,0 +1,63 @@
+# Generated by Django 5.2.17 on 2026-08-26 16:48
+
+import email_service.models
+from django.db import migrations, models
+
+
+def set_fillfactor(apps, schema_editor):
+    """Leave page slack for HOT updates on the counter columns (PostgreSQL only)"""
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute('ALTER TABLE email_tracking_pixels SET (fillfactor = 90)')
+        cursor.execute('ALTER TABLE email_click_tracking SET (fillfactor = 90)')
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("email_service", "0014_alter_emailevent_options_and_more"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="emailclicktracking",
+            name="id",
+            field=models.UUIDField(
+                default=email_service.models.uuid7,
+                editable=False,
+                primary_key=True,
+                serialize=False,
+            ),
+        ),
+        migrations.AlterField(
+            model_name="emailevent",
+            name="id",
+            field=models.UUIDField(
+                default=email_service.models.uuid7,
+                editable=False,
+                primary_key=True,
+                serialize=False,
+            ),
+        ),
+        migrations.AlterField(
+            model_name="emailsendqueue",
+            name="id",
+            field=models.UUIDField(
+                default=email_service.models.uuid7,
+                editable=False,
+                primary_key=True,
+                serialize=False,
+            ),
+        ),
+        migrations.AlterField(
+            model_name="emailtrackingpixel",
+            name="id",
+            field=models.UUIDField(
+                default=email_service.models.uuid7,
+                editable=False,
+                primary_key=True,
+                serialize=False,
+            ),
+        ),
+        migrations.RunPython(set_fillfactor, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 5.2.17 on 2026-08-26 17:02
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        (
+            "email_service",
+            "0015_alter_emailclicktracking_id_alter_emailevent_id_and_more",
+        ),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name="emailsendqueue",
+            name="esq_pending_sched",
+        ),
+        migrations.AddIndex(
+            model_name="emailsendqueue",
+            index=models.Index(
+                condition=models.Q(("status", "PENDING")),
+                fields=["scheduled_for"],
+                include=("id", "client_id", "lead_id"),
+                name="esq_pending_sched",
+            ),
+        ),
+    ]
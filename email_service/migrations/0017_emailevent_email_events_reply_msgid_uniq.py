@@ -0,0 +1,20 @@
+# Generated by Django 5.2.17 on 2026-08-26 17:41
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("email_service", "0016_remove_emailsendqueue_esq_pending_sched_and_more"),
+    ]
+
+    operations = [
+        migrations.AddConstraint(
+            model_name="emailevent",
+            constraint=models.UniqueConstraint(
+                condition=models.Q(("event_type", "REPLY")),
+                fields=("message_id",),
+                name="email_events_reply_msgid_uniq",
+            ),
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.2.17 on 2026-08-26 17:49
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("email_service", "0017_emailevent_email_events_reply_msgid_uniq"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="emailevent",
+            index=models.Index(
+                fields=["client_id", "event_type", "created_at"],
+                name="email_event_client__b76bce_idx",
+            ),
+        ),
+    ]
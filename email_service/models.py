@@ -2,11 +2,24 @@
 Django models for email tracking and management
 Corresponds to tables created in DATABASE_SCHEMA_GMAIL.sql
 """
-from django.db import models
+from django.db import models, transaction
+import hashlib
 import uuid
+import uuid_utils
 from django.utils import timezone
 
 
+def uuid7():
+    """
+    Time-ordered UUIDv7 for hot-write primary keys
+
+    Random v4 PKs land on random B-tree pages; v7 sorts by time so
+    inserts append to the right edge of the PK index (smaller working
+    set, less WAL). Wrapped so Django gets a stdlib uuid.UUID.
+    """
+    return uuid.UUID(bytes=uuid_utils.uuid7().bytes)
+
+
 class EmailEvent(models.Model):
     """
     Tracks all email events (sent, opened, clicked, replied, bounced)
@@ -20,10 +33,12 @@ class EmailEvent(models.Model):
         ('BOUNCE', 'Bounce')
     ]
     
-    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
-    lead_id = models.UUIDField(db_index=True)
+    id = models.UUIDField(primary_key=True, default=uuid7, editable=False)
+    # No single-column index: the (lead_id, event_type) composite below
+    # already leads with lead_id
+    lead_id = models.UUIDField()
     client_id = models.UUIDField(db_index=True)
-    
+
     event_type = models.CharField(max_length=10, choices=EVENT_TYPES, db_index=True)
     
     # Gmail identifiers
@@ -40,10 +55,9 @@ class EmailEvent(models.Model):
     ip_address = models.GenericIPAddressField(null=True, blank=True)
     device_type = models.CharField(max_length=50, blank=True)
     
-    # Reply data (for REPLY events)
-    reply_content = models.TextField(blank=True, null=True)
-    reply_snippet = models.TextField(blank=True, null=True)
-    
+    # Reply bodies live in EmailEventBody (cold sibling table) so the
+    # hot row stays narrow for scans and aggregates
+
     # Timestamps
     created_at = models.DateTimeField(auto_now_add=True, db_index=True)
     
@@ -51,23 +65,67 @@ class EmailEvent(models.Model):
     metadata = models.JSONField(default=dict, blank=True)
     
     class Meta:
+        # No default ordering: Meta.ordering attaches an ORDER BY to
+        # every queryset, including counts/aggregates; list endpoints
+        # order explicitly instead
         db_table = 'email_events'
-        ordering = ['-created_at']
         indexes = [
             models.Index(fields=['lead_id', 'event_type']),
-            models.Index(fields=['message_id', 'created_at'])
+            models.Index(fields=['message_id', 'created_at']),
+            # One range scan serves the per-client window x event_type
+            # stats aggregation and the MV refresh queries
+            models.Index(fields=['client_id', 'created_at', 'event_type']),
+            # Recency-ordered listings of one event type (the replies
+            # endpoint): equality on the first two columns, walk
+            # created_at descending, stop at the limit
+            models.Index(fields=['client_id', 'event_type', 'created_at'])
+        ]
+        constraints = [
+            # Gmail history polling can deliver the same reply twice;
+            # the partial scope keeps OPEN/CLICK free to repeat per
+            # message while a duplicate REPLY insert fails cleanly
+            models.UniqueConstraint(
+                fields=['message_id'],
+                condition=models.Q(event_type='REPLY'),
+                name='email_events_reply_msgid_uniq'
+            )
         ]
     
     def __str__(self):
         return f"{self.event_type} - {self.message_id} - {self.created_at}"
 
 
+class EmailEventBody(models.Model):
+    """
+    Cold storage for reply bodies (vertical partition of email_events)
+    Table: email_event_bodies
+    Only REPLY events have one; joined in solely when the body is
+    actually requested so list/aggregate queries over email_events read
+    narrow rows.
+    """
+    event = models.OneToOneField(
+        EmailEvent,
+        primary_key=True,
+        on_delete=models.CASCADE,
+        related_name='body',
+        db_column='event_id'
+    )
+    reply_content = models.TextField(blank=True, null=True)
+    reply_snippet = models.TextField(blank=True, null=True)
+
+    class Meta:
+        db_table = 'email_event_bodies'
+
+    def __str__(self):
+        return f"Body for event {self.event_id}"
+
+
 class EmailTrackingPixel(models.Model):
     """
     Maps unique pixel IDs to emails for open tracking
     Table: email_tracking_pixels
     """
-    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    id = models.UUIDField(primary_key=True, default=uuid7, editable=False)
     lead_id = models.UUIDField(db_index=True)
     message_id = models.CharField(max_length=255)
     
@@ -93,7 +151,7 @@ class EmailClickTracking(models.Model):
     Maps unique click IDs to destination URLs
     Table: email_click_tracking
     """
-    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    id = models.UUIDField(primary_key=True, default=uuid7, editable=False)
     lead_id = models.UUIDField(db_index=True)
     message_id = models.CharField(max_length=255)
     
@@ -178,7 +236,7 @@ class EmailSendQueue(models.Model):
         ('CANCELLED', 'Cancelled')
     ]
     
-    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    id = models.UUIDField(primary_key=True, default=uuid7, editable=False)
     lead_id = models.UUIDField(db_index=True)
     client_id = models.UUIDField(db_index=True)
     
@@ -188,9 +246,9 @@ class EmailSendQueue(models.Model):
         default='unknown@placeholder.com'  # Temporary default for migration
     )
     
-    # Email content
+    # Email content (the HTML body lives in EmailSendQueueBody so queue
+    # scans don't drag full emails through every page)
     email_subject = models.TextField()
-    email_body = models.TextField()
     email_cta = models.TextField(blank=True)
     
     # Sequence info
@@ -218,15 +276,198 @@ class EmailSendQueue(models.Model):
     updated_at = models.DateTimeField(auto_now=True)
     
     class Meta:
+        # No default ordering (see EmailEvent.Meta); the dispatcher
+        # orders by scheduled_for explicitly
         db_table = 'email_send_queue'
-        ordering = ['scheduled_for']
         indexes = [
-            models.Index(fields=['status', 'scheduled_for']),
+            # Partial index covering only the live PENDING set - the
+            # dispatcher never scans SENT/FAILED history, so there is no
+            # point keeping those rows in the B-tree. INCLUDE makes the
+            # claim/fan-out scans index-only (no heap fetch per row).
+            models.Index(
+                fields=['scheduled_for'],
+                name='esq_pending_sched',
+                condition=models.Q(status='PENDING'),
+                include=['id', 'client_id', 'lead_id']
+            ),
         ]
     
     def __str__(self):
         return f"Email {self.id} - {self.status} - {self.scheduled_for}"
 
+    @classmethod
+    def claim_batch(cls, batch_size=100, candidate_ids=None):
+        """
+        Atomically claim a batch of due PENDING emails for sending
+
+        Uses SELECT ... FOR UPDATE SKIP LOCKED so concurrent dispatcher
+        workers each claim disjoint rows (no double-sends), then marks
+        the whole batch SENDING with one multi-row UPDATE instead of a
+        save() per row. The transaction commits before any Gmail I/O
+        happens, so row locks are held only for the claim itself - this
+        is what makes it safe to run several dispatcher/send workers in
+        parallel.
+
+        Args:
+            batch_size: Maximum number of emails to claim
+            candidate_ids: optional id list (e.g. from the Redis
+                schedule mirror) restricting the scan to known-due rows
+
+        Returns:
+            List of claimed email IDs (ordered by scheduled_for)
+        """
+        now = timezone.now()
+        with transaction.atomic():
+            candidates = cls.objects.select_for_update(skip_locked=True).filter(
+                status='PENDING',
+                scheduled_for__lte=now
+            )
+            if candidate_ids is not None:
+                candidates = candidates.filter(id__in=candidate_ids)
+            ids = list(
+                candidates.order_by('scheduled_for').values_list('id', flat=True)[:batch_size]
+            )
+            if ids:
+                cls.objects.filter(id__in=ids).update(
+                    status='SENDING',
+                    updated_at=now
+                )
+        return ids
+
+
+class EmailSendQueueBody(models.Model):
+    """
+    Cold storage for queued email HTML (vertical partition of
+    email_send_queue)
+    Table: email_queue_bodies
+    Read once at send time via select_related('body'); the queue row
+    itself stays narrow for dispatcher scans and the admin changelist.
+    """
+    queue = models.OneToOneField(
+        EmailSendQueue,
+        primary_key=True,
+        on_delete=models.CASCADE,
+        related_name='body',
+        db_column='queue_id'
+    )
+    email_body = models.TextField()
+
+    class Meta:
+        db_table = 'email_queue_bodies'
+
+    def __str__(self):
+        return f"Body for queued email {self.queue_id}"
+
+
+class CampaignSequenceCounters(models.Model):
+    """
+    Denormalized per-(client, sequence) event counters
+    Table: campaign_sequence_counters
+    Maintained by a PostgreSQL AFTER INSERT trigger on email_events
+    (migration 0007) so the campaigns dashboard reads ready-made counts
+    instead of aggregating email_events per request.
+    """
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    client_id = models.UUIDField(db_index=True)
+    sequence_number = models.IntegerField()
+
+    sent = models.IntegerField(default=0)
+    opens = models.IntegerField(default=0)
+    clicks = models.IntegerField(default=0)
+    replies = models.IntegerField(default=0)
+    last_sent = models.DateTimeField(null=True, blank=True)
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = 'campaign_sequence_counters'
+        constraints = [
+            models.UniqueConstraint(
+                fields=['client_id', 'sequence_number'],
+                name='unique_client_sequence_counters'
+            )
+        ]
+
+    def __str__(self):
+        return f"{self.client_id} seq {self.sequence_number}: {self.sent} sent"
+
+
+class StatsMVRegistry(models.Model):
+    """
+    Registry of per-client stats materialized views
+    Table: stats_mv_registry
+    Each active client can get a dedicated hash-named view
+    (mv_stats_<sha1(client_id)>) holding only its own day/event_type
+    counts, so its dashboard reads a tiny table that scales with that
+    client's volume. Views are built lazily by build_client_stats_mv
+    and refreshed only when new events have landed since the last
+    refresh (cheap for quiet clients). PostgreSQL only.
+    """
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    client_id = models.UUIDField(unique=True)
+    mv_name = models.CharField(max_length=63, unique=True)
+    last_refreshed = models.DateTimeField(null=True, blank=True)
+
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        db_table = 'stats_mv_registry'
+
+    def __str__(self):
+        return f"{self.mv_name} for {self.client_id}"
+
+    @staticmethod
+    def mv_name_for(client_id):
+        """Hash-named per-client view (stable, identifier-safe)"""
+        digest = hashlib.sha1(str(client_id).encode()).hexdigest()[:16]
+        return f"mv_stats_{digest}"
+
+    @classmethod
+    def get_or_build(cls, client_id):
+        """
+        Return the view name if it's ready, else schedule a build
+
+        Args:
+            client_id: UUID of the client
+
+        Returns:
+            The mv_name once built and refreshed, or None (caller
+            falls back to the global mv_client_daily_stats view)
+        """
+        from django.db import connection
+        if connection.vendor != 'postgresql':
+            return None
+
+        entry = cls.objects.filter(client_id=client_id).first()
+        if entry and entry.last_refreshed:
+            return entry.mv_name
+
+        from .tasks import build_client_stats_mv
+        build_client_stats_mv.delay(str(client_id))
+        return None
+
+
+class ClientDailyStats(models.Model):
+    """
+    Read-only window onto the mv_client_daily_stats materialized view
+    One row per (client_id, day, event_type) with a precomputed count,
+    refreshed every few minutes by the refresh_client_daily_stats task.
+    Dashboard stats/timeline endpoints read this instead of aggregating
+    email_events live. PostgreSQL only (created by migration 0005).
+    """
+    client_id = models.UUIDField(primary_key=True)  # Not a real PK; Django requires one
+    day = models.DateTimeField()
+    event_type = models.CharField(max_length=10)
+    cnt = models.BigIntegerField()
+
+    class Meta:
+        managed = False
+        db_table = 'mv_client_daily_stats'
+
+    def __str__(self):
+        return f"{self.client_id} {self.day:%Y-%m-%d} {self.event_type}: {self.cnt}"
+
 
 class LeadMailboxAssignment(models.Model):
     """
@@ -240,7 +481,9 @@ class LeadMailboxAssignment(models.Model):
     ]
     
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
-    lead_id = models.UUIDField(db_index=True, help_text="Lead ID from AISDR database")
+    # No single-column index: the unique_together (lead_id, client_id)
+    # index already leads with lead_id
+    lead_id = models.UUIDField(help_text="Lead ID from AISDR database")
     client_id = models.UUIDField(db_index=True, help_text="Client ID from AISDR database")
     assigned_email = models.EmailField(help_text="Which mailbox is assigned to this lead")
     
@@ -256,15 +499,62 @@ class LeadMailboxAssignment(models.Model):
         db_table = 'lead_mailbox_assignments'
         unique_together = [['lead_id', 'client_id']]
         indexes = [
-            models.Index(fields=['lead_id']),
-            models.Index(fields=['client_id']),
             models.Index(fields=['assigned_email']),
-            models.Index(fields=['status']),
+            # Lookups only ever filter for live assignments, so a
+            # partial index keeps inactive history out of the B-tree
+            models.Index(
+                fields=['status'],
+                name='lma_active_status',
+                condition=models.Q(status='active')
+            ),
         ]
     
     def __str__(self):
         return f"Lead {self.lead_id} → {self.assigned_email} ({self.email_count} emails)"
 
+    @classmethod
+    def touch_bulk(cls, assignments, batch_size=500):
+        """
+        Upsert many lead→mailbox assignments in two queries
+
+        Replaces per-lead get_or_create + save() loops with one
+        multi-row INSERT ... ON CONFLICT (lead_id, client_id) DO UPDATE
+        followed by a single F()-expression UPDATE for the usage
+        counters (bulk_create can't express an increment).
+
+        Args:
+            assignments: Iterable of (lead_id, client_id, assigned_email)
+            batch_size: Rows per INSERT statement
+
+        Returns:
+            Number of assignments touched
+        """
+        rows = [
+            cls(lead_id=lead_id, client_id=client_id, assigned_email=assigned_email)
+            for lead_id, client_id, assigned_email in assignments
+        ]
+        if not rows:
+            return 0
+
+        now = timezone.now()
+        cls.objects.bulk_create(
+            rows,
+            update_conflicts=True,
+            unique_fields=['lead_id', 'client_id'],
+            update_fields=['assigned_email', 'last_used_at', 'status'],
+            batch_size=batch_size
+        )
+
+        pair_filter = models.Q()
+        for row in rows:
+            pair_filter |= models.Q(lead_id=row.lead_id, client_id=row.client_id)
+        cls.objects.filter(pair_filter).update(
+            email_count=models.F('email_count') + 1,
+            last_used_at=now,
+            status='active'
+        )
+        return len(rows)
+
 
 # Note: These models reference the 'leads' and 'clients' tables which exist
 # in the main AISDR database. We don't need to define them here as they're
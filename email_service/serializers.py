@@ -20,12 +20,22 @@ class EmailEventSerializer(serializers.ModelSerializer):
             'id', 'lead_id', 'client_id', 'event_type',
             'message_id', 'thread_id', 'sequence_number',
             'email_subject', 'url', 'user_agent', 'ip_address',
-            'device_type', 'reply_content', 'reply_snippet',
-            'created_at', 'metadata'
+            'device_type', 'created_at'
         ]
         read_only_fields = ['id', 'created_at']
 
 
+class EmailEventDetailSerializer(EmailEventSerializer):
+    """Event serializer including metadata and the reply body (joins email_event_bodies)"""
+    reply_content = serializers.CharField(source='body.reply_content', default=None)
+    reply_snippet = serializers.CharField(source='body.reply_snippet', default=None)
+
+    class Meta(EmailEventSerializer.Meta):
+        fields = EmailEventSerializer.Meta.fields + [
+            'metadata', 'reply_content', 'reply_snippet'
+        ]
+
+
 class EmailTrackingPixelSerializer(serializers.ModelSerializer):
     """Serializer for tracking pixels"""
     
@@ -82,7 +92,7 @@ class EmailSendQueueSerializer(serializers.ModelSerializer):
         model = EmailSendQueue
         fields = [
             'id', 'lead_id', 'client_id', 'recipient_email',
-            'email_subject', 'email_body', 'email_cta',
+            'email_subject', 'email_cta',
             'sequence_number', 'send_delay_days', 'scheduled_for',
             'status', 'attempts', 'max_attempts', 'last_error',
             'failed_at', 'message_id', 'sent_at', 'sent_from_email',
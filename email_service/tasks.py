@@ -2,230 +2,1037 @@
 Celery tasks for email service
 Background tasks for sending emails, checking replies, etc.
 """
-from celery import shared_task
-from django.utils import timezone
-from django.conf import settings
 import logging
+import uuid
+import zlib
+from collections import Counter, defaultdict
+
+from celery import chord, group, shared_task
+from django.conf import settings
+from django.db.models import Case, F, Q, Value, When
+from django.db.models.functions import Coalesce
+from django.utils import timezone
 
-from .models import EmailSendQueue, GmailToken, EmailTrackingPixel, EmailEvent
+from .models import (
+    EmailSendQueue, GmailToken, EmailTrackingPixel, EmailEvent, EmailEventBody,
+    LeadMailboxAssignment,
+)
 from .gmail_client import GmailClientFactory
 from .tracking import EmailTracker
-from .utils import get_aisdr_connection
+from .utils import (
+    get_aisdr_connection,
+    get_or_assign_mailbox_for_lead,
+    get_schedule_redis,
+    plug_db_leaks,
+    pop_due_queue_ids,
+    release_client_daily_send,
+    reserve_client_daily_send,
+    resolve_mailboxes_for_leads,
+    schedule_queue_ids,
+)
 
 logger = logging.getLogger(__name__)
 
 
+def _process_queue_email(email, client_limits=None, event_sink=None, mailboxes=None):
+    """
+    Send one claimed EmailSendQueue row
+
+    Callers must have claimed the row first (status SENDING, via
+    EmailSendQueue.claim_batch or a compare-and-swap update) so
+    concurrent workers never pick up the same email. The queue row
+    itself is NOT written here: callers pass the outcome to
+    _finalize_send_results, so batch dispatchers finalize a whole batch
+    in two UPDATEs instead of a save() per row.
+
+    Args:
+        email: EmailSendQueue instance
+        client_limits: optional dict of remaining daily budget per
+            client_id str (from _load_client_limits). When given, the
+            limit precheck and decrement happen against the dict and the
+            caller is responsible for flushing counters back to the
+            clients table; when None each row pays its own SELECT/UPDATE
+        event_sink: optional list collecting unsaved SENT EmailEvent
+            rows for a caller-side bulk_create; when None the event is
+            inserted immediately
+        mailboxes: optional dict from resolve_mailboxes_for_leads keyed
+            by (lead_id str, client_id str); when None the sticky
+            assignment is resolved with per-lead queries
+
+    Returns:
+        ('sent', message_id, from_email), ('failed', error_message) or
+        ('skipped', None, None) when the client is at its daily limit
+    """
+    reserved = None
+    try:
+        # Check if client has reached daily limit. The Redis token
+        # bucket is the cross-worker gate (concurrent shard batches
+        # share it); the batch-local dict / Postgres check backs it up
+        # when Redis is unavailable.
+        reserved = reserve_client_daily_send(email.client_id)
+        if client_limits is not None:
+            has_budget = reserved is not False and \
+                client_limits.get(str(email.client_id), 0) > 0
+        elif reserved is not None:
+            has_budget = reserved
+        else:
+            has_budget = check_client_daily_limit(email.client_id)
+        if not has_budget:
+            if reserved:
+                release_client_daily_send(email.client_id)
+            logger.warning(f"Client {email.client_id} has reached daily email limit")
+            # Release the claim so the next tick retries
+            EmailSendQueue.objects.filter(pk=email.pk).update(status='PENDING')
+            schedule_queue_ids([(email.pk, email.scheduled_for)])
+            return ('skipped', None, None)
+
+        # Get assigned mailbox for this lead (sticky assignment)
+        # Same lead always uses same mailbox (Ben's requirement)
+        if mailboxes is not None:
+            gmail_token = mailboxes.get((str(email.lead_id), str(email.client_id)))
+        else:
+            gmail_token = get_or_assign_mailbox_for_lead(email.lead_id, email.client_id)
+
+        if not gmail_token:
+            raise Exception(f"No active mailbox available for client {email.client_id}")
+
+        # Create Gmail client from the assigned token
+        gmail_client = GmailClientFactory.from_gmail_token(gmail_token)
+
+        if not gmail_client:
+            raise Exception(f"Failed to create Gmail client for token {gmail_token.email_address}")
+
+        # Generate temporary message ID for tracking
+        temp_message_id = uuid.uuid4().hex
+
+        # Add tracking to email body (HTML lives in the sibling
+        # email_queue_bodies table; callers select_related('body'))
+        html_with_tracking = EmailTracker.add_tracking_to_email(
+            email.body.email_body,
+            email.lead_id,
+            temp_message_id,
+            email.client_id
+        )
+
+        # Send email via Gmail
+        result = gmail_client.send_email(
+            to_email=email.recipient_email,  # Email passed from n8n (AISDR database)
+            subject=email.email_subject,
+            body_html=html_with_tracking
+        )
+
+        if result.get('success'):
+            # Log SENT event (batch callers collect and bulk_create)
+            sent_event = EmailEvent(
+                lead_id=email.lead_id,
+                client_id=email.client_id,
+                event_type='SENT',
+                message_id=result['message_id'],
+                thread_id=result.get('thread_id'),
+                sequence_number=email.sequence_number,
+                email_subject=email.email_subject
+            )
+            if event_sink is not None:
+                event_sink.append(sent_event)
+            else:
+                sent_event.save()
+
+            # Update lead metrics
+            update_lead_sent_metrics(email.lead_id)
+
+            # Increment client daily counter (batch callers decrement the
+            # shared dict and flush one UPDATE after the loop)
+            if client_limits is not None:
+                client_limits[str(email.client_id)] -= 1
+            else:
+                increment_client_daily_counter(email.client_id)
+
+            logger.info(f"Email sent successfully: {email.id}")
+            return ('sent', result['message_id'], gmail_token.email_address)
+
+        raise Exception(result.get('error', 'Unknown error'))
+
+    except Exception as e:
+        # Return the reserved Redis slot: nothing went out
+        if reserved:
+            release_client_daily_send(email.client_id)
+        logger.warning(f"Email {email.id} failed (attempt {email.attempts + 1}): {e}")
+        return ('failed', str(e), None)
+
+
+def _finalize_send_results(successes, failures):
+    """
+    Write a batch of send outcomes back in two bulk UPDATEs
+
+    Per-row values (message_id, sent mailbox, error text) are routed
+    through Case/When so a 100-email batch costs two statements instead
+    of 100 save() round trips. Failure rows get attempts bumped via F()
+    and flip to FAILED or back to PENDING (rescheduled +5 min) depending
+    on whether the bump reaches max_attempts.
+
+    Args:
+        successes: list of (email, message_id, from_email) tuples
+        failures: list of (email, error_message) tuples
+    """
+    now = timezone.now()
+    batch_size = settings.EMAIL_QUEUE_BULK_BATCH_SIZE
+
+    for i in range(0, len(successes), batch_size):
+        chunk = successes[i:i + batch_size]
+        EmailSendQueue.objects.filter(id__in=[e.id for e, _, _ in chunk]).update(
+            status='SENT',
+            sent_at=now,
+            updated_at=now,
+            message_id=Case(
+                *[When(id=e.id, then=Value(mid)) for e, mid, _ in chunk],
+            ),
+            sent_from_email=Case(
+                *[When(id=e.id, then=Value(sender)) for e, _, sender in chunk],
+            ),
+        )
+
+    # attempts is incremented in the same statement, so "exhausted" means
+    # the pre-increment value is already at max_attempts - 1
+    exhausted = Q(attempts__gte=F('max_attempts') - 1)
+    for i in range(0, len(failures), batch_size):
+        chunk = failures[i:i + batch_size]
+        EmailSendQueue.objects.filter(id__in=[e.id for e, _ in chunk]).update(
+            attempts=F('attempts') + 1,
+            updated_at=now,
+            last_error=Case(
+                *[When(id=e.id, then=Value(error)) for e, error in chunk],
+            ),
+            status=Case(
+                When(exhausted, then=Value('FAILED')),
+                default=Value('PENDING'),
+            ),
+            failed_at=Case(
+                When(exhausted, then=Value(now)),
+                default=F('failed_at'),
+            ),
+            scheduled_for=Case(
+                When(exhausted, then=F('scheduled_for')),
+                default=Value(now + timezone.timedelta(minutes=5)),
+            ),
+        )
+
+    # Re-mirror retrying rows into the Redis schedule zset
+    if failures:
+        schedule_queue_ids(
+            EmailSendQueue.objects.filter(
+                id__in=[e.id for e, _ in failures], status='PENDING'
+            ).values_list('id', 'scheduled_for')
+        )
+
+
+def _load_client_limits(client_ids):
+    """
+    Fetch remaining daily send budget for a set of clients in one query
+
+    Replaces the per-email check_client_daily_limit SELECT (+ optional
+    reset UPDATE) inside the batch loop with a single ANY(...) fetch.
+    Clients whose last_reset_date is stale are reset with one bulk
+    UPDATE and counted as a full budget.
+
+    Args:
+        client_ids: iterable of client UUIDs (or strings)
+
+    Returns:
+        dict mapping client_id str -> remaining sends today
+    """
+    from datetime import date
+
+    ids = [str(c) for c in client_ids]
+    if not ids:
+        return {}
+
+    limits = {}
+    stale = []
+    today = date.today()
+    with get_aisdr_connection().cursor() as cursor:
+        cursor.execute("""
+            SELECT id, gmail_daily_limit, emails_sent_today, last_reset_date
+            FROM clients
+            WHERE id = ANY(%s::uuid[])
+        """, [ids])
+        for client_id, daily_limit, sent_today, last_reset in cursor.fetchall():
+            if last_reset < today:
+                stale.append(str(client_id))
+                sent_today = 0
+            limits[str(client_id)] = daily_limit - sent_today
+
+        if stale:
+            cursor.execute("""
+                UPDATE clients
+                SET emails_sent_today = 0,
+                    last_reset_date = CURRENT_DATE
+                WHERE id = ANY(%s::uuid[])
+            """, [stale])
+
+    return limits
+
+
+def _flush_client_daily_counters(sent_counts):
+    """
+    Push per-client send counts back to the clients table in one UPDATE
+
+    Args:
+        sent_counts: mapping of client_id str -> number of emails sent
+    """
+    if not sent_counts:
+        return
+
+    from psycopg2.extras import execute_values
+
+    with get_aisdr_connection().cursor() as cursor:
+        execute_values(cursor, """
+            UPDATE clients
+            SET emails_sent_today = emails_sent_today + data.delta
+            FROM (VALUES %s) AS data(id, delta)
+            WHERE clients.id = data.id::uuid
+        """, list(sent_counts.items()))
+
+
+def _finalize_single(email, outcome):
+    """Finalize one email's queue row from a _process_queue_email outcome"""
+    status, detail, sender = outcome
+    if status == 'sent':
+        _finalize_send_results([(email, detail, sender)], [])
+    elif status == 'failed':
+        _finalize_send_results([], [(email, detail)])
+    return status == 'sent'
+
+
+@shared_task
+@plug_db_leaks
+def send_queued_email(email_queue_id):
+    """
+    Send one queued email (fan-out target for backlog overflow)
+
+    Args:
+        email_queue_id: UUID of EmailSendQueue record
+    """
+    # Compare-and-swap claim: only one worker wins the PENDING -> SENDING
+    # transition, so duplicate deliveries of this task are no-ops
+    claimed = EmailSendQueue.objects.filter(
+        id=email_queue_id, status='PENDING'
+    ).update(status='SENDING', updated_at=timezone.now())
+
+    if not claimed:
+        return {'sent': False, 'email_id': str(email_queue_id)}
+
+    email = EmailSendQueue.objects.select_related('body').get(id=email_queue_id)
+    sent = _finalize_single(email, _process_queue_email(email))
+    return {'sent': sent, 'email_id': str(email_queue_id)}
+
+
+@shared_task(ignore_result=True)
+@plug_db_leaks
+def record_open_async(pixel_id, user_agent=None, ip_address=None):
+    """
+    Record a tracking-pixel open off the request path
+
+    track_open enqueues this so the web tier serves the PNG without
+    waiting on the recording work; the actual write still goes through
+    the Redis open buffer inside record_open.
+    """
+    EmailTracker.record_open(
+        pixel_id=pixel_id,
+        user_agent=user_agent,
+        ip_address=ip_address
+    )
+
+
+@shared_task(ignore_result=True)
+@plug_db_leaks
+def record_click_async(click_id, user_agent=None, ip_address=None):
+    """
+    Record a link click off the request path
+
+    track_click answers the redirect from the Redis click-URL mirror
+    and enqueues this; the counter/event/lead writes happen here.
+    """
+    EmailTracker.record_click(
+        click_id=click_id,
+        user_agent=user_agent,
+        ip_address=ip_address
+    )
+
+
+@shared_task(ignore_result=True)
+@plug_db_leaks
+def touch_last_login(client_id):
+    """
+    Write a client's last_login timestamp off the login path
+
+    Non-critical bookkeeping; client_login enqueues this so the
+    response doesn't spend a round trip on it after bcrypt.
+    """
+    with get_aisdr_connection().cursor() as cursor:
+        cursor.execute(
+            "UPDATE clients SET last_login = NOW() WHERE id = %s",
+            (client_id,)
+        )
+
+
+def _shard_for_lead(lead_id):
+    """Stable shard index for a lead (crc32, not process-salted hash())"""
+    from OreeStats.celery import GMAIL_SEND_SHARDS
+    return zlib.crc32(str(lead_id).encode()) % GMAIL_SEND_SHARDS
+
+
 @shared_task
+@plug_db_leaks
 def process_email_queue():
     """
-    Process emails in the send queue that are ready to be sent
+    Dispatch ready queue rows to the gmail-N shard queues
     Runs every minute via Celery Beat
+
+    Claims rows atomically (FOR UPDATE SKIP LOCKED), buckets them by
+    lead shard and fans them out as a chord of send_claimed_batch tasks.
+    The sticky lead->mailbox assignment means one mailbox's sends stay
+    serialized inside a shard queue while different mailboxes run in
+    parallel on the gevent workers; the chord callback aggregates the
+    per-batch counts.
     """
     logger.info("Processing email send queue...")
-    
-    # Get emails ready to send
-    ready_emails = EmailSendQueue.objects.filter(
-        status='PENDING',
-        scheduled_for__lte=timezone.now()
-    ).order_by('scheduled_for')[:100]  # Batch of 100
-    
-    sent_count = 0
-    failed_count = 0
-    
-    for email in ready_emails:
-        try:
-            # Check if client has reached daily limit
-            if not check_client_daily_limit(email.client_id):
-                logger.warning(f"Client {email.client_id} has reached daily email limit")
-                continue
-            
-            # Update status to SENDING
-            email.status = 'SENDING'
-            email.save()
-            
-            # Get assigned mailbox for this lead (sticky assignment)
-            # Same lead always uses same mailbox (Ben's requirement)
-            from .utils import get_or_assign_mailbox_for_lead
-            gmail_token = get_or_assign_mailbox_for_lead(email.lead_id, email.client_id)
-            
-            if not gmail_token:
-                raise Exception(f"No active mailbox available for client {email.client_id}")
-            
-            # Create Gmail client from the assigned token
-            gmail_client = GmailClientFactory.from_gmail_token(gmail_token)
-            
-            if not gmail_client:
-                raise Exception(f"Failed to create Gmail client for token {gmail_token.email_address}")
-            
-            # Generate temporary message ID for tracking
-            import uuid
-            temp_message_id = str(uuid.uuid4())
-            
-            # Add tracking to email body
-            html_with_tracking = EmailTracker.add_tracking_to_email(
-                email.email_body,
-                email.lead_id,
-                temp_message_id,
-                email.client_id
+
+    # Pop ready ids from the Redis schedule mirror (O(log N)) and claim
+    # just those rows; fall back to the SQL scan when Redis is absent.
+    # Either way the claim itself (FOR UPDATE SKIP LOCKED) is what
+    # guarantees overlapping dispatcher runs never grab the same rows.
+    due_ids = pop_due_queue_ids(limit=1000)
+    claimed_ids = EmailSendQueue.claim_batch(batch_size=1000, candidate_ids=due_ids)
+    if not claimed_ids:
+        return {'dispatched': 0, 'batches': 0}
+
+    shards = defaultdict(list)
+    for pk, lead_id in EmailSendQueue.objects.filter(
+        id__in=claimed_ids
+    ).order_by('scheduled_for').values_list('id', 'lead_id'):
+        shards[_shard_for_lead(lead_id)].append(str(pk))
+
+    signatures = []
+    for shard, ids in shards.items():
+        for i in range(0, len(ids), 100):
+            signatures.append(
+                send_claimed_batch.s(ids[i:i + 100]).set(queue=f'gmail-{shard}')
             )
-            
-            # Send email via Gmail
-            result = gmail_client.send_email(
-                to_email=email.recipient_email,  # Email passed from n8n (AISDR database)
-                subject=email.email_subject,
-                body_html=html_with_tracking
+
+    chord(group(signatures))(tally_send_results.s())
+    logger.info(
+        f"Dispatched {len(claimed_ids)} emails as {len(signatures)} shard batches"
+    )
+    return {'dispatched': len(claimed_ids), 'batches': len(signatures)}
+
+
+@shared_task
+@plug_db_leaks
+def send_claimed_batch(email_ids):
+    """
+    Send a batch of pre-claimed queue rows (chord member)
+
+    Rows arrive already in SENDING from the dispatcher's claim_batch.
+    Daily limits are prechecked from one batched SELECT, queue rows are
+    finalized in two Case/When UPDATEs, SENT events go out as one
+    bulk_create and client counters flush in a single UPDATE.
+
+    Args:
+        email_ids: list of EmailSendQueue UUID strings
+
+    Returns:
+        dict with sent/failed counts for the chord callback
+    """
+    ready_emails = list(
+        EmailSendQueue.objects.select_related('body').filter(
+            id__in=email_ids, status='SENDING'
+        ).order_by('scheduled_for')
+    )
+
+    # Replied leads halt their sequence: drop any claimed rows flagged
+    # in the replied_leads set (one SMISMEMBER for the whole batch) and
+    # cancel them instead of sending
+    redis_client = get_schedule_redis()
+    if redis_client is not None and ready_emails:
+        try:
+            flags = redis_client.smismember(
+                'replied_leads', [str(email.lead_id) for email in ready_emails]
             )
-            
-            if result.get('success'):
-                # Update email record
-                email.status = 'SENT'
-                email.message_id = result['message_id']
-                email.sent_at = timezone.now()
-                email.sent_from_email = gmail_token.email_address  # Track which mailbox sent this
-                email.save()
-                
-                # Log SENT event
-                EmailEvent.objects.create(
-                    lead_id=email.lead_id,
-                    client_id=email.client_id,
-                    event_type='SENT',
-                    message_id=result['message_id'],
-                    thread_id=result.get('thread_id'),
-                    sequence_number=email.sequence_number,
-                    email_subject=email.email_subject
-                )
-                
-                # Update lead metrics
-                update_lead_sent_metrics(email.lead_id)
-                
-                # Increment client daily counter
-                increment_client_daily_counter(email.client_id)
-                
-                sent_count += 1
-                logger.info(f"Email sent successfully: {email.id}")
-                
-            else:
-                raise Exception(result.get('error', 'Unknown error'))
-            
+            replied = [email for email, flag in zip(ready_emails, flags) if flag]
+            if replied:
+                EmailSendQueue.objects.filter(
+                    id__in=[email.id for email in replied]
+                ).update(status='CANCELLED', updated_at=timezone.now())
+                logger.info(f"Cancelled {len(replied)} claimed sends for replied leads")
+                ready_emails = [
+                    email for email, flag in zip(ready_emails, flags) if not flag
+                ]
         except Exception as e:
-            email.attempts += 1
-            email.last_error = str(e)
-            
-            if email.attempts >= email.max_attempts:
-                email.status = 'FAILED'
-                email.failed_at = timezone.now()
-                logger.error(f"Email {email.id} failed after {email.attempts} attempts: {e}")
-            else:
-                email.status = 'PENDING'
-                # Reschedule for 5 minutes later
-                email.scheduled_for = timezone.now() + timezone.timedelta(minutes=5)
-                logger.warning(f"Email {email.id} failed (attempt {email.attempts}), will retry: {e}")
-            
-            email.save()
-            failed_count += 1
-    
-    logger.info(f"Email queue processed: {sent_count} sent, {failed_count} failed")
-    return {'sent': sent_count, 'failed': failed_count}
+            logger.warning(f"Replied-lead check failed: {e}")
+
+    # Load every client's remaining daily budget up front so the loop
+    # checks an in-memory dict instead of a SELECT per email
+    client_limits = _load_client_limits({email.client_id for email in ready_emails})
+
+    # Resolve every lead's sticky mailbox in two queries instead of
+    # per-lead lookups inside the loop
+    mailboxes = resolve_mailboxes_for_leads(
+        (email.lead_id, email.client_id) for email in ready_emails
+    )
+
+    # Collect outcomes and finalize the whole batch in two UPDATEs
+    # (Case/When routes per-row values) instead of a save() per email
+    successes = []
+    failures = []
+    sent_events = []
+
+    def run_group(emails):
+        for email in emails:
+            status, detail, sender = _process_queue_email(
+                email, client_limits=client_limits, event_sink=sent_events,
+                mailboxes=mailboxes
+            )
+            if status == 'sent':
+                successes.append((email, detail, sender))
+            elif status == 'failed':
+                failures.append((email, detail))
+
+    # Overlap the Gmail RTTs: group emails by resolved mailbox and send
+    # the groups as concurrent greenlets (the worker pool is gevent, so
+    # the monkey-patched HTTPS sockets yield between sends) while each
+    # mailbox's own emails stay strictly serial for Gmail's per-user
+    # concurrency limit. Outside a gevent worker the pool degrades to
+    # roughly serial execution, which is the old behavior.
+    groups = defaultdict(list)
+    for email in ready_emails:
+        token = mailboxes.get((str(email.lead_id), str(email.client_id)))
+        groups[token.id if token else None].append(email)
+
+    try:
+        from gevent.pool import Pool
+        Pool(50).map(run_group, groups.values())
+    except ImportError:
+        for emails in groups.values():
+            run_group(emails)
+
+    _finalize_send_results(successes, failures)
+
+    # One multi-row INSERT for the batch's SENT events
+    if sent_events:
+        EmailEvent.objects.bulk_create(
+            sent_events, batch_size=settings.EMAIL_EVENTS_BULK_BATCH_SIZE
+        )
+
+    # One bulk counter UPDATE against the clients table for the batch
+    _flush_client_daily_counters(Counter(str(e.client_id) for e, _, _ in successes))
+
+    # Persist/touch sticky assignments for everything that went out
+    # (the upsert also creates rows for freshly rotated leads)
+    if successes:
+        LeadMailboxAssignment.touch_bulk(
+            {(str(e.lead_id), str(e.client_id), sender) for e, _, sender in successes}
+        )
+
+    return {'sent': len(successes), 'failed': len(failures)}
+
+
+@shared_task
+def tally_send_results(results):
+    """Chord callback aggregating shard batch counts into one log line"""
+    totals = {'sent': 0, 'failed': 0}
+    for result in results or []:
+        totals['sent'] += result.get('sent', 0)
+        totals['failed'] += result.get('failed', 0)
+    logger.info(f"Email queue processed: {totals['sent']} sent, {totals['failed']} failed")
+    return totals
 
 
 @shared_task
+@plug_db_leaks
+def rehydrate_email_schedule():
+    """
+    Re-hydrate the Redis schedule mirror from PENDING queue rows
+    Runs every 5 minutes via Celery Beat
+
+    Crash recovery for the zset: enqueues that missed their ZADD (Redis
+    hiccup, restart) are re-mirrored here. zadd is idempotent, so
+    re-adding already-mirrored ids is a no-op.
+    """
+    if get_schedule_redis() is None:
+        return {'mirrored': 0}
+
+    pending = list(
+        EmailSendQueue.objects.filter(status='PENDING')
+        .order_by('scheduled_for')
+        .values_list('id', 'scheduled_for')[:10000]
+    )
+    schedule_queue_ids(pending)
+    return {'mirrored': len(pending)}
+
+
+@shared_task
+@plug_db_leaks
 def check_for_replies():
     """
-    Check for replies to sent emails
+    Fan reply polling out as one task per active mailbox
     Runs every 15 minutes via Celery Beat
+
+    The old serial loop was bound by the sum of Google RTTs across all
+    mailboxes. Each token now polls in its own task, routed by
+    crc32(token_id) to a gmail-poll-N queue so a mailbox's successive
+    polls never interleave across workers; the chord callback aggregates
+    the counts into the familiar log line.
     """
+    from OreeStats.celery import GMAIL_SEND_SHARDS
+
     logger.info("Checking for email replies...")
-    
-    # Get all active Gmail tokens
-    tokens = GmailToken.objects.filter(status='active')
-    
+
+    token_ids = list(
+        GmailToken.objects.filter(status='active').values_list('id', flat=True)
+    )
+    if not token_ids:
+        return {'dispatched': 0}
+
+    signatures = [
+        check_replies_for_token.s(str(token_id)).set(
+            queue=f'gmail-poll-{zlib.crc32(str(token_id).encode()) % GMAIL_SEND_SHARDS}'
+        )
+        for token_id in token_ids
+    ]
+    chord(group(signatures))(tally_reply_results.s())
+    return {'dispatched': len(token_ids)}
+
+
+@shared_task
+@plug_db_leaks
+def check_replies_for_token(token_id):
+    """
+    Poll one mailbox for replies (fan-out target of check_for_replies)
+
+    Args:
+        token_id: UUID of the GmailToken to poll
+    """
+    try:
+        token = GmailToken.objects.get(id=token_id)
+    except GmailToken.DoesNotExist:
+        return {'replies_found': 0}
+
     replies_found = 0
-    
-    for token in tokens:
-        try:
-            gmail_client = GmailClientFactory.from_gmail_token(token)
-            
-            if not gmail_client:
-                continue
-            
-            # Get current history ID
+    try:
+        gmail_client = GmailClientFactory.from_gmail_token(token)
+
+        if not gmail_client:
+            return {'replies_found': 0}
+
+        # Check for new messages since last check; the history
+        # response itself carries the advanced cursor, so the
+        # per-mailbox getProfile round-trip is only paid when the
+        # cursor is missing or expired. Pages stream lazily, so memory
+        # stays flat however much history piled up, and each page's
+        # messages go through the batch endpoint and the vectorized
+        # reply matcher before the next page is fetched.
+        if token.last_history_id:
+            next_history_id = None
+            expired = False
+            for history, page_history_id in gmail_client.iter_history_pages(
+                token.last_history_id
+            ):
+                if page_history_id is None:
+                    expired = True
+                    break
+                next_history_id = page_history_id
+
+                message_ids = [
+                    msg_added['message']['id']
+                    for history_record in history
+                    for msg_added in history_record.get('messagesAdded', [])
+                ]
+                messages = gmail_client.get_messages_batch(message_ids)
+                replies_found += process_potential_replies(messages, token.client_id)
+
+            if expired:
+                # Cursor expired (404): re-baseline from the profile
+                # and pick up again on the next poll
+                profile = gmail_client.get_profile()
+                next_history_id = profile.get('historyId') if profile else None
+                logger.warning(
+                    f"History cursor expired for {token.email_address}, re-baselined"
+                )
+        else:
+            # First poll for this mailbox: baseline the cursor
             profile = gmail_client.get_profile()
-            if not profile:
-                continue
-            
-            current_history_id = profile.get('historyId')
-            
-            # Check for new messages since last check
-            if token.last_history_id:
-                history = gmail_client.list_history(token.last_history_id)
-                
-                for history_record in history:
-                    messages_added = history_record.get('messagesAdded', [])
-                    
-                    for msg_added in messages_added:
-                        message_id = msg_added['message']['id']
-                        
-                        # Get full message
-                        message = gmail_client.get_message(message_id)
-                        
-                        if message:
-                            # Check if this is a reply to one of our sent emails
-                            process_potential_reply(message, token.client_id, gmail_client)
-                            replies_found += 1
-            
-            # Update last_history_id
-            token.last_history_id = current_history_id
-            token.save()
-            
-        except Exception as e:
-            logger.error(f"Error checking replies for client {token.client_id}: {e}")
-    
+            next_history_id = profile.get('historyId') if profile else None
+
+        # Persist the cursor only when it actually moved
+        if next_history_id and str(next_history_id) != str(token.last_history_id or ''):
+            token.last_history_id = str(next_history_id)
+            token.save(update_fields=['last_history_id'])
+
+    except Exception as e:
+        logger.error(f"Error checking replies for client {token.client_id}: {e}")
+
+    return {'replies_found': replies_found}
+
+
+@shared_task
+def tally_reply_results(results):
+    """Chord callback aggregating per-mailbox reply counts"""
+    replies_found = sum(r.get('replies_found', 0) for r in results or [])
     logger.info(f"Reply check complete: {replies_found} potential replies found")
     return {'replies_found': replies_found}
 
 
 @shared_task
-def reset_daily_limits():
+@plug_db_leaks
+def flush_pixel_events():
     """
-    Reset daily email counters for all clients
-    Runs daily at midnight UTC via Celery Beat
+    Fold Redis-buffered pixel opens into Postgres in bulk
+    Runs every minute via Celery Beat
+
+    Drains the pixels:dirty set in batches of 1000, reads each pixel's
+    buffered hash and applies all deltas with one
+    UPDATE ... FROM (VALUES ...). After the write the buffered delta is
+    decremented (not deleted), so opens that land mid-flush re-enter the
+    dirty set and survive to the next run.
     """
-    logger.info("Resetting daily email limits...")
-    
-    with get_aisdr_connection().cursor() as cursor:
-        cursor.execute("""
-            UPDATE clients
-            SET emails_sent_today = 0,
-                last_reset_date = CURRENT_DATE
-            WHERE last_reset_date < CURRENT_DATE
-        """)
-        
-        reset_count = cursor.rowcount
-    
-    logger.info(f"Reset daily limits for {reset_count} clients")
-    return {'reset_count': reset_count}
+    from django.db import connection
+    from django.utils.dateparse import parse_datetime
+    from .tracking import PIXEL_DIRTY_SET
+
+    client = get_schedule_redis()
+    if client is None:
+        return {'flushed': 0}
+
+    flushed = 0
+    while True:
+        dirty = client.spop(PIXEL_DIRTY_SET, 1000)
+        if not dirty:
+            break
+        pixel_ids = [p.decode() for p in dirty]
+
+        pipe = client.pipeline()
+        for pixel_id in pixel_ids:
+            pipe.hgetall(f'pixel:{pixel_id}')
+
+        rows = []
+        for pixel_id, data in zip(pixel_ids, pipe.execute()):
+            delta = int(data.get(b'open_count', 0)) if data else 0
+            if delta <= 0:
+                continue
+            rows.append((
+                pixel_id,
+                delta,
+                data.get(b'first_opened_at', b'').decode() or None,
+                data.get(b'last_opened_at', b'').decode() or None,
+            ))
+
+        if rows:
+            if connection.vendor == 'postgresql':
+                from psycopg2.extras import execute_values
+                with connection.cursor() as cursor:
+                    execute_values(cursor, """
+                        UPDATE email_tracking_pixels AS p
+                        SET opened = TRUE,
+                            open_count = p.open_count + data.delta,
+                            first_opened_at = COALESCE(
+                                p.first_opened_at, data.first_seen::timestamptz
+                            ),
+                            last_opened_at = GREATEST(
+                                COALESCE(p.last_opened_at, data.last_seen::timestamptz),
+                                data.last_seen::timestamptz
+                            )
+                        FROM (VALUES %s) AS data(pixel_id, delta, first_seen, last_seen)
+                        WHERE p.pixel_id = data.pixel_id
+                    """, rows)
+            else:
+                for pixel_id, delta, first_seen, last_seen in rows:
+                    EmailTrackingPixel.objects.filter(pixel_id=pixel_id).update(
+                        opened=True,
+                        open_count=F('open_count') + delta,
+                        first_opened_at=Coalesce(
+                            F('first_opened_at'), Value(parse_datetime(first_seen))
+                        ),
+                        last_opened_at=parse_datetime(last_seen),
+                    )
+
+            # Fold the same deltas into lead open metrics (one bulk
+            # UPDATE on the AISDR side instead of one per hit)
+            lead_for_pixel = dict(
+                EmailTrackingPixel.objects.filter(
+                    pixel_id__in=[r[0] for r in rows]
+                ).values_list('pixel_id', 'lead_id')
+            )
+            lead_deltas = Counter()
+            lead_seen = {}
+            for pixel_id, delta, _, last_seen in rows:
+                lead_id = lead_for_pixel.get(pixel_id)
+                if lead_id is None:
+                    continue
+                lead_id = str(lead_id)
+                lead_deltas[lead_id] += delta
+                if last_seen and last_seen > lead_seen.get(lead_id, ''):
+                    lead_seen[lead_id] = last_seen
+            EmailTracker.flush_lead_open_metrics([
+                (
+                    lead_id,
+                    delta,
+                    lead_seen.get(lead_id) or timezone.now().isoformat(),
+                )
+                for lead_id, delta in lead_deltas.items()
+            ])
+
+            # Drain the folded deltas; a concurrent open between the
+            # read and this decrement re-adds the pixel to the dirty set
+            pipe = client.pipeline()
+            for pixel_id, delta, _, _ in rows:
+                pipe.hincrby(f'pixel:{pixel_id}', 'open_count', -delta)
+            pipe.execute()
+            flushed += len(rows)
+
+        if len(pixel_ids) < 1000:
+            break
+
+    if flushed:
+        logger.info(f"Flushed {flushed} buffered pixel opens")
+    return {'flushed': flushed}
+
+
+@shared_task
+@plug_db_leaks
+def flush_reply_metrics():
+    """
+    Fold Redis-buffered reply counters into the leads table in bulk
+    Runs every 5 seconds via Celery Beat
+
+    track_reply buffers per-lead emails_replied increments
+    (buffer_lead_reply); this drains the dirty set and applies all
+    deltas with one UPDATE ... FROM (VALUES ...) per batch, so reply
+    bursts on the same thread cost one row lock instead of one per
+    reply.
+    """
+    from .tracking import REPLY_DIRTY_SET
+
+    client = get_schedule_redis()
+    if client is None:
+        return {'flushed': 0}
+
+    flushed = 0
+    while True:
+        dirty = client.spop(REPLY_DIRTY_SET, 1000)
+        if not dirty:
+            break
+        lead_ids = [l.decode() for l in dirty]
+
+        pipe = client.pipeline()
+        for lead_id in lead_ids:
+            pipe.hgetall(f'lead_reply:{lead_id}')
+
+        rows = []
+        for lead_id, data in zip(lead_ids, pipe.execute()):
+            delta = int(data.get(b'count', 0)) if data else 0
+            if delta <= 0:
+                continue
+            rows.append((
+                lead_id,
+                delta,
+                data.get(b'first_replied_at', b'').decode() or None,
+                data.get(b'last_replied_at', b'').decode() or None,
+            ))
+
+        if rows:
+            from psycopg2.extras import execute_values
+            with get_aisdr_connection().cursor() as cursor:
+                execute_values(cursor, """
+                    UPDATE leads
+                    SET emails_replied = emails_replied + data.delta,
+                        first_replied_at = COALESCE(
+                            first_replied_at, data.first_at::timestamptz
+                        ),
+                        last_engagement_type = 'REPLY',
+                        last_engagement_at = data.last_at::timestamptz,
+                        sequence_status = 'REPLIED'
+                    FROM (VALUES %s) AS data(id, delta, first_at, last_at)
+                    WHERE leads.id = data.id::uuid
+                """, rows, page_size=500)
+
+            # Drain the folded deltas; a reply landing between the read
+            # and this decrement re-adds the lead to the dirty set
+            pipe = client.pipeline()
+            for lead_id, delta, _, _ in rows:
+                pipe.hincrby(f'lead_reply:{lead_id}', 'count', -delta)
+            pipe.execute()
+            flushed += len(rows)
+
+        if len(lead_ids) < 1000:
+            break
+
+    if flushed:
+        logger.info(f"Flushed {flushed} buffered reply counters")
+    return {'flushed': flushed}
+
+
+# Note: the old reset_daily_limits task (midnight UPDATE over the whole
+# clients table) is gone. Daily budgets are now date-scoped: the Redis
+# counter key embeds the date and simply rolls over, and stale
+# emails_sent_today rows are reset lazily (and only for clients that
+# actually send) by _load_client_limits.
 
 
 @shared_task
+@plug_db_leaks
+def reset_mailbox_daily_counts():
+    """
+    Reset per-mailbox daily send counters
+    Runs daily at midnight UTC via Celery Beat (one UPDATE statement)
+    """
+    from .utils import reset_daily_send_counts
+
+    return {'reset_count': reset_daily_send_counts()}
+
+
+@shared_task
+@plug_db_leaks
 def cleanup_expired_pixels():
     """
     Delete expired tracking pixels
     Runs daily at 2 AM UTC via Celery Beat
     """
+    from django.db import connection
+
     logger.info("Cleaning up expired tracking pixels...")
-    
+
     # Delete pixels older than 30 days
     cutoff_date = timezone.now() - timezone.timedelta(days=30)
-    
-    deleted_count, _ = EmailTrackingPixel.objects.filter(
-        created_at__lt=cutoff_date
-    ).delete()
-    
+
+    if connection.vendor == 'postgresql':
+        # Raw batched DELETE: the queryset .delete() pulls every PK into
+        # Python to walk cascades (there are none here), which is O(N)
+        # memory on millions of rows. ctid batches of 10k keep each
+        # transaction short so vacuum and replication aren't stalled.
+        deleted_count = 0
+        with connection.cursor() as cursor:
+            while True:
+                cursor.execute("""
+                    DELETE FROM email_tracking_pixels
+                    WHERE ctid IN (
+                        SELECT ctid FROM email_tracking_pixels
+                        WHERE created_at < %s
+                        LIMIT 10000
+                    )
+                """, [cutoff_date])
+                deleted_count += cursor.rowcount
+                if cursor.rowcount < 10000:
+                    break
+    else:
+        deleted_count, _ = EmailTrackingPixel.objects.filter(
+            created_at__lt=cutoff_date
+        ).delete()
+
     logger.info(f"Deleted {deleted_count} expired tracking pixels")
     return {'deleted_count': deleted_count}
 
 
 @shared_task
+@plug_db_leaks
+def refresh_client_daily_stats():
+    """
+    Refresh the mv_client_daily_stats materialized view
+    Runs every 5 minutes via Celery Beat. CONCURRENTLY keeps the
+    dashboard endpoints readable during the refresh.
+    """
+    from django.db import connection
+
+    if connection.vendor != 'postgresql':
+        logger.info("Skipping mv_client_daily_stats refresh (not PostgreSQL)")
+        return {'refreshed': False}
+
+    with connection.cursor() as cursor:
+        cursor.execute('REFRESH MATERIALIZED VIEW CONCURRENTLY mv_client_daily_stats')
+
+    logger.info("Refreshed mv_client_daily_stats")
+    return {'refreshed': True}
+
+
+@shared_task
+@plug_db_leaks
+def build_client_stats_mv(client_id):
+    """
+    Build the per-client stats materialized view (lazy, on first use)
+
+    Args:
+        client_id: UUID string of the client
+    """
+    from django.db import connection
+    from .models import StatsMVRegistry
+
+    if connection.vendor != 'postgresql':
+        return {'built': False}
+
+    entry, _ = StatsMVRegistry.objects.get_or_create(
+        client_id=client_id,
+        defaults={'mv_name': StatsMVRegistry.mv_name_for(client_id)}
+    )
+
+    with connection.cursor() as cursor:
+        # mv_name comes from the registry (hash of the client UUID),
+        # never from user input
+        cursor.execute(f"""
+            CREATE MATERIALIZED VIEW IF NOT EXISTS {entry.mv_name} AS
+            SELECT date_trunc('day', created_at) AS day,
+                   event_type,
+                   count(*) AS cnt
+            FROM email_events
+            WHERE client_id = %s
+            GROUP BY 1, 2
+        """, [str(client_id)])
+        cursor.execute(f"""
+            CREATE UNIQUE INDEX IF NOT EXISTS {entry.mv_name}_uq
+            ON {entry.mv_name} (day, event_type)
+        """)
+
+    entry.last_refreshed = timezone.now()
+    entry.save(update_fields=['last_refreshed'])
+
+    logger.info(f"Built per-client stats view {entry.mv_name}")
+    return {'built': True, 'mv_name': entry.mv_name}
+
+
+@shared_task
+@plug_db_leaks
+def refresh_client_stats_mvs():
+    """
+    Refresh per-client stats views that have new events
+    Runs every 5 minutes via Celery Beat. Clients with no events since
+    their last refresh are skipped, so quiet clients cost nothing.
+    """
+    from django.db import connection
+    from .models import StatsMVRegistry
+
+    if connection.vendor != 'postgresql':
+        return {'refreshed': 0}
+
+    refreshed = 0
+    for entry in StatsMVRegistry.objects.exclude(last_refreshed=None):
+        has_new_events = EmailEvent.objects.filter(
+            client_id=entry.client_id,
+            created_at__gt=entry.last_refreshed
+        ).exists()
+        if not has_new_events:
+            continue
+
+        with connection.cursor() as cursor:
+            cursor.execute(f'REFRESH MATERIALIZED VIEW CONCURRENTLY {entry.mv_name}')
+
+        entry.last_refreshed = timezone.now()
+        entry.save(update_fields=['last_refreshed'])
+        refreshed += 1
+
+    logger.info(f"Refreshed {refreshed} per-client stats views")
+    return {'refreshed': refreshed}
+
+
+@shared_task
+@plug_db_leaks
 def send_single_email(email_queue_id):
     """
     Send a single email immediately (for testing or manual triggering)
@@ -235,22 +1042,22 @@ def send_single_email(email_queue_id):
     """
     try:
         email = EmailSendQueue.objects.get(id=email_queue_id)
-        
-        if email.status != 'PENDING':
-            return {'error': f'Email status is {email.status}, not PENDING'}
-        
-        # Process just this email
-        email.scheduled_for = timezone.now()
-        email.save()
-        
-        # Trigger processing
-        process_email_queue.delay()
-        
-        return {'success': True, 'email_id': str(email_queue_id)}
-        
     except EmailSendQueue.DoesNotExist:
         return {'error': 'Email not found'}
 
+    # Claim the row (PENDING -> SENDING) before sending so a concurrent
+    # dispatcher run can't pick it up too
+    claimed = EmailSendQueue.objects.filter(
+        id=email_queue_id, status='PENDING'
+    ).update(status='SENDING', updated_at=timezone.now())
+
+    if not claimed:
+        return {'error': f'Email status is {email.status}, not PENDING'}
+
+    email.refresh_from_db()
+    sent = _finalize_single(email, _process_queue_email(email))
+    return {'success': sent, 'email_id': str(email_queue_id)}
+
 
 # Helper functions
 
@@ -264,34 +1071,67 @@ def check_client_daily_limit(client_id):
     Returns:
         Boolean
     """
+    from datetime import date
+
+    # Redis-first: the date-scoped counter never needs resetting, it
+    # just rolls over to a fresh key at midnight. Seed it from today's
+    # SENT events on a cold read so restarts don't forget sends.
+    client = get_schedule_redis()
+    if client is not None:
+        try:
+            cid = str(client_id)
+            today = timezone.now()
+            sent_key = f"client:{cid}:sent:{today.strftime('%Y%m%d')}"
+
+            limit = client.get(f'client:{cid}:limit')
+            if limit is None:
+                with get_aisdr_connection().cursor() as cursor:
+                    cursor.execute(
+                        "SELECT gmail_daily_limit FROM clients WHERE id = %s", [cid]
+                    )
+                    row = cursor.fetchone()
+                if not row:
+                    return False
+                limit = row[0]
+                client.setex(f'client:{cid}:limit', 300, int(limit))
+
+            sent = client.get(sent_key)
+            if sent is None:
+                midnight = today.replace(hour=0, minute=0, second=0, microsecond=0)
+                sent = EmailEvent.objects.filter(
+                    client_id=client_id,
+                    event_type='SENT',
+                    created_at__gte=midnight
+                ).count()
+                # SET NX so a concurrent INCR from the send path wins
+                client.set(sent_key, sent, ex=172800, nx=True)
+
+            return int(sent) < int(limit)
+        except Exception as e:
+            logger.warning(f"Redis daily-limit check failed: {e}")
+
+    # Postgres fallback. A stale last_reset_date simply means nothing
+    # was counted today - no reset write on the read path.
     with get_aisdr_connection().cursor() as cursor:
         cursor.execute("""
-            SELECT 
+            SELECT
                 gmail_daily_limit,
                 emails_sent_today,
                 last_reset_date
             FROM clients
             WHERE id = %s
         """, [str(client_id)])
-        
+
         row = cursor.fetchone()
-        
+
         if not row:
             return False
-        
+
         daily_limit, sent_today, last_reset = row
-        
-        # Reset if new day
-        from datetime import date
+
         if last_reset < date.today():
-            cursor.execute("""
-                UPDATE clients
-                SET emails_sent_today = 0,
-                    last_reset_date = CURRENT_DATE
-                WHERE id = %s
-            """, [str(client_id)])
             return True
-        
+
         # Check limit
         return sent_today < daily_limit
 
@@ -349,66 +1189,126 @@ def update_lead_sent_metrics(lead_id):
         """, [timezone.now(), str(lead_id)])
 
 
-def process_potential_reply(message, client_id, gmail_client):
+def process_potential_replies(messages, client_id):
     """
-    Process a potential reply message
-    
+    Match a batch of inbox messages against our SENT threads, log replies
+
+    Replaces the per-message SELECT/INSERT/UPDATE triple: one
+    ANY(text[]) lookup maps every thread_id to its lead, reply events
+    land as two bulk_creates (event row + cold body row) and lead
+    metrics flush with a single execute_values UPDATE.
+
     Args:
-        message: Gmail message object
+        messages: List of Gmail message objects
         client_id: UUID of client
-        gmail_client: GmailClient instance
+
+    Returns:
+        Number of replies logged
     """
     try:
-        from .gmail_client import parse_email_headers, get_email_body
-        
-        # Parse headers
-        headers = parse_email_headers(message)
-        thread_id = message.get('threadId')
-        message_id = message.get('id')
-        
-        # Check if this thread contains any of our sent emails
+        from psycopg2.extras import execute_values
+        from .gmail_client import get_email_body
+
+        candidates = [m for m in messages if m.get('threadId')]
+        if not candidates:
+            return 0
+
+        # One round-trip resolving all threads that contain our sends
+        thread_ids = list({m['threadId'] for m in candidates})
         with get_aisdr_connection().cursor() as cursor:
             cursor.execute("""
-                SELECT DISTINCT lead_id, message_id
+                SELECT DISTINCT ON (thread_id) thread_id, lead_id
                 FROM email_events
                 WHERE client_id = %s
-                AND thread_id = %s
                 AND event_type = 'SENT'
-                LIMIT 1
-            """, [str(client_id), thread_id])
-            
-            row = cursor.fetchone()
-            
-            if row:
-                lead_id, original_message_id = row
-                
-                # Get email body
-                body = get_email_body(message)
-                snippet = message.get('snippet', '')
-                
-                # Create reply event
-                EmailEvent.objects.create(
-                    lead_id=lead_id,
-                    client_id=client_id,
-                    event_type='REPLY',
-                    message_id=message_id,
-                    thread_id=thread_id,
+                AND thread_id = ANY(%s::text[])
+                ORDER BY thread_id
+            """, [str(client_id), thread_ids])
+            thread_to_lead = dict(cursor.fetchall())
+
+        # Gmail redelivers history pages after partial failures, and the
+        # partial unique index on REPLY message_id would reject the whole
+        # bulk_create over one duplicate - drop already-logged ids first
+        message_ids = [m['id'] for m in candidates if m.get('id')]
+        already_logged = set(
+            EmailEvent.objects.filter(
+                event_type='REPLY', message_id__in=message_ids
+            ).values_list('message_id', flat=True)
+        )
+
+        replies = []
+        for message in candidates:
+            lead_id = thread_to_lead.get(message['threadId'])
+            if lead_id is None:
+                continue
+            if message.get('id') and message['id'] in already_logged:
+                continue
+            event = EmailEvent(
+                lead_id=lead_id,
+                client_id=client_id,
+                event_type='REPLY',
+                message_id=message.get('id'),
+                thread_id=message['threadId']
+            )
+            replies.append((event, get_email_body(message), message.get('snippet', '')))
+
+        if not replies:
+            return 0
+
+        # Reply events + bodies in two multi-row INSERTs (body text goes
+        # to the cold sibling table)
+        batch_size = settings.EMAIL_EVENTS_BULK_BATCH_SIZE
+        EmailEvent.objects.bulk_create(
+            [event for event, _, _ in replies], batch_size=batch_size
+        )
+        EmailEventBody.objects.bulk_create(
+            [
+                EmailEventBody(
+                    event_id=event.pk,
                     reply_content=body,
                     reply_snippet=snippet[:200]
                 )
-                
-                # Update lead metrics
-                cursor.execute("""
-                    UPDATE leads
-                    SET emails_replied = emails_replied + 1,
-                        first_replied_at = COALESCE(first_replied_at, %s),
-                        last_engagement_type = 'REPLY',
-                        last_engagement_at = %s,
-                        sequence_status = 'REPLIED'
-                    WHERE id = %s
-                """, [timezone.now(), timezone.now(), str(lead_id)])
-                
-                logger.info(f"Logged reply for lead {lead_id}")
-                
+                for event, body, snippet in replies
+            ],
+            batch_size=batch_size
+        )
+
+        # Update lead metrics in one statement; per-lead reply counts go
+        # through VALUES so a lead with several replies gets the full delta
+        now = timezone.now()
+        deltas = Counter(str(event.lead_id) for event, _, _ in replies)
+        with get_aisdr_connection().cursor() as cursor:
+            execute_values(cursor, """
+                UPDATE leads
+                SET emails_replied = emails_replied + data.delta,
+                    first_replied_at = COALESCE(first_replied_at, data.replied_at),
+                    last_engagement_type = 'REPLY',
+                    last_engagement_at = data.replied_at,
+                    sequence_status = 'REPLIED'
+                FROM (VALUES %s) AS data(id, delta, replied_at)
+                WHERE leads.id = data.id::uuid
+            """, [(lead_id, delta, now) for lead_id, delta in deltas.items()])
+
+        # A reply halts the sequence: cancel any still-pending sends for
+        # these leads in one UPDATE and flag them in Redis so the
+        # dispatcher skips rows enqueued after this point
+        replied_lead_ids = list(deltas.keys())
+        cancelled = EmailSendQueue.objects.filter(
+            lead_id__in=replied_lead_ids, status='PENDING'
+        ).update(status='CANCELLED', updated_at=now)
+        if cancelled:
+            logger.info(f"Cancelled {cancelled} pending sends for replied leads")
+
+        redis_client = get_schedule_redis()
+        if redis_client is not None:
+            try:
+                redis_client.sadd('replied_leads', *replied_lead_ids)
+            except Exception as e:
+                logger.warning(f"Failed to flag replied leads in Redis: {e}")
+
+        logger.info(f"Logged {len(replies)} replies for client {client_id}")
+        return len(replies)
+
     except Exception as e:
-        logger.error(f"Error processing potential reply: {e}")
+        logger.error(f"Error processing potential replies: {e}")
+        return 0
@@ -2,6 +2,7 @@ import json
 import uuid
 from django.test import TestCase, override_settings
 from django.urls import reverse
+from email_service.events import queue_batcher
 from email_service.models import EmailSendQueue, EmailTrackingPixel
 from email_service.utils import generate_client_jwt, verify_client_jwt
 from email_service.tracking import TrackingPixelGenerator, EmailTracker
@@ -30,6 +31,9 @@ class EmailServiceTests(TestCase):
         data = resp.json()
         self.assertTrue(data['success'])
         self.assertIn('queue_id', data)
+        # Single emails go through the write-behind buffer; drain it
+        # before asserting on the row
+        queue_batcher.flush()
         self.assertTrue(EmailSendQueue.objects.filter(id=data['queue_id']).exists())
 
     def test_send_email_requires_api_key(self):
@@ -49,6 +53,22 @@ class EmailServiceTests(TestCase):
         )
         self.assertEqual(resp.status_code, 401)
 
+    @override_settings(OREE_API_KEY=None)
+    def test_send_email_rejects_when_no_key_configured(self):
+        # An unset key must reject with 401, not blow up in
+        # compare_digest with a 500
+        from email_service.utils import _expected_api_key
+        _expected_api_key.cache_clear()
+        self.addCleanup(_expected_api_key.cache_clear)
+        url = reverse('email_service:send_email')
+        resp = self.client.post(
+            url,
+            data='{}',
+            content_type='application/json',
+            HTTP_AUTHORIZATION='Bearer anything',
+        )
+        self.assertEqual(resp.status_code, 401)
+
     def test_jwt_roundtrip(self):
         token = generate_client_jwt(str(uuid.uuid4()), 'Acme', 'self_serve', 'client@acme.com')
         payload = verify_client_jwt(token)
@@ -60,7 +80,18 @@ class EmailServiceTests(TestCase):
     def test_tracking_pixel_headers(self):
         headers = TrackingPixelGenerator.get_pixel_headers()
         self.assertEqual(headers['Content-Type'], 'image/png')
-        self.assertIn('no-cache', headers['Cache-Control'])
+        self.assertIn('must-revalidate', headers['Cache-Control'])
+        self.assertEqual(headers['ETag'], TrackingPixelGenerator.PIXEL_ETAG)
+
+    def test_track_open_conditional_get(self):
+        pid = str(uuid.uuid4())
+        EmailTrackingPixel.objects.create(lead_id=uuid.uuid4(), message_id='msg304', pixel_id=pid)
+        url = reverse('email_service:track_open', kwargs={'pixel_id': pid})
+        resp = self.client.get(url, HTTP_IF_NONE_MATCH=TrackingPixelGenerator.PIXEL_ETAG)
+        self.assertEqual(resp.status_code, 304)
+        # The open is still recorded on a revalidation hit
+        pixel = EmailTrackingPixel.objects.get(pixel_id=pid)
+        self.assertTrue(pixel.opened)
 
     def test_track_open_endpoint_updates_pixel(self):
         pid = str(uuid.uuid4())
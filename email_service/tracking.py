@@ -2,16 +2,177 @@
 Email Tracking System
 Handles open tracking (pixels) and click tracking (redirects)
 """
+import base64
+import hashlib
+import os
+import re
 import secrets
+import threading
+from functools import lru_cache
+from cachetools import LRUCache
 from django.utils import timezone
 from django.conf import settings
+from django.db.models import F, Value
+from django.db.models.functions import Coalesce
+import lxml.html
 from bs4 import BeautifulSoup
 from .models import EmailTrackingPixel, EmailClickTracking, EmailEvent
-from .utils import get_aisdr_connection
+from .events import event_batcher
+from .utils import get_aisdr_connection, get_schedule_redis, ua_tokens
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Redis key layout for the pixel open buffer: one hash per pixel with
+# the pending open delta and first/last timestamps, plus a dirty set
+# that flush_pixel_events drains. Keys expire after two days so
+# orphaned buffers (deleted pixels, bad ids) clean themselves up.
+PIXEL_BUFFER_TTL = 172800
+PIXEL_DIRTY_SET = 'pixels:dirty'
+
+# Leads with Redis-buffered reply increments awaiting flush_reply_metrics
+REPLY_DIRTY_SET = 'lead_replies:dirty'
+
+# click_id -> destination_url mirror, written when tracked links are
+# generated so the redirect never waits on Postgres. 60 days outlives
+# any realistic campaign.
+CLICK_URL_TTL = 60 * 86400
+
+# Prepared tracking templates keyed by body hash. Sequence emails share
+# the same HTML, so the BeautifulSoup parse happens once per template
+# and per-email rendering is plain str.replace.
+_TEMPLATE_CACHE = LRUCache(maxsize=256)
+_TEMPLATE_CACHE_LOCK = threading.Lock()
+
+# Cheap pre-check before the HTML parse: bodies with no <a href=...> at
+# all (plain-text-in-HTML, link-free footers) skip the whole pipeline
+_ANCHOR_RE = re.compile(r'<a\b[^>]*\bhref\s*=', re.IGNORECASE)
+
+# Placeholder pattern for rendered templates; one sub() call swaps in
+# every per-lead tracking URL in a single scan of the document
+_TRACK_RE = re.compile(r'__TRACK_(\d+)__')
+
+
+@lru_cache(maxsize=1)
+def _tracking_prefixes():
+    """
+    Tracking URL prefixes, built once
+
+    Settings access goes through LazyObject.__getattr__ on every read;
+    the domain/protocol never change at runtime, so the hot URL-building
+    paths concatenate onto these instead of re-formatting per call.
+    Lazy (not module level) so settings are configured before first use.
+
+    Returns:
+        Tuple of (open prefix, click prefix)
+    """
+    base = f"{settings.TRACKING_PROTOCOL}://{settings.TRACKING_DOMAIN}/api/track"
+    return f"{base}/open/", f"{base}/click/"
+
+
+def _batch_token_urlsafe(n, nbytes=32):
+    """
+    Draw n URL-safe tokens from a single os.urandom call
+
+    secrets.token_urlsafe costs one getrandom syscall per ID; an email
+    with K links needs K click_ids, so one big buffer is sliced
+    instead. Output format matches secrets.token_urlsafe(nbytes).
+    """
+    buf = os.urandom(n * nbytes)
+    return [
+        base64.urlsafe_b64encode(buf[i * nbytes:(i + 1) * nbytes])
+        .rstrip(b'=').decode('ascii')
+        for i in range(n)
+    ]
+
+
+def _mirror_click_urls(pairs):
+    """Best-effort pipelined SETEX of click_id -> destination_url"""
+    client = get_schedule_redis()
+    if client is None or not pairs:
+        return
+    try:
+        pipe = client.pipeline()
+        for click_id, destination_url in pairs:
+            pipe.setex(f'click:{click_id}', CLICK_URL_TTL, destination_url)
+        pipe.execute()
+    except Exception as e:
+        logger.warning(f"Click URL mirror failed: {e}")
+
+
+def get_click_destination(click_id):
+    """
+    Destination URL for a click_id from the Redis mirror, or None
+
+    None means Redis is down or the key aged out - callers fall back to
+    the DB path in record_click.
+    """
+    client = get_schedule_redis()
+    if client is None:
+        return None
+    try:
+        dest = client.get(f'click:{click_id}')
+    except Exception:
+        return None
+    return dest.decode() if dest else None
+
+
+def buffer_pixel_open(pixel_id, now):
+    """
+    Buffer one pixel open in Redis instead of writing Postgres inline
+
+    Returns:
+        True if buffered (flush_pixel_events will fold it into the
+        pixel row later), False when Redis is unavailable so the caller
+        falls back to the synchronous UPDATE
+    """
+    client = get_schedule_redis()
+    if client is None:
+        return False
+    try:
+        key = f'pixel:{pixel_id}'
+        pipe = client.pipeline()
+        pipe.hincrby(key, 'open_count', 1)
+        pipe.hsetnx(key, 'first_opened_at', now.isoformat())
+        pipe.hset(key, 'last_opened_at', now.isoformat())
+        pipe.expire(key, PIXEL_BUFFER_TTL)
+        pipe.sadd(PIXEL_DIRTY_SET, str(pixel_id))
+        pipe.execute()
+        return True
+    except Exception as e:
+        logger.warning(f"Pixel open buffer failed: {e}")
+        return False
+
+
+def buffer_lead_reply(lead_id, now):
+    """
+    Buffer one reply's lead-counter increment in Redis
+
+    Multi-reply bursts on the same lead otherwise issue one
+    emails_replied row UPDATE each; flush_reply_metrics folds the
+    aggregated deltas into a single batched UPDATE every few seconds.
+
+    Returns:
+        True if buffered, False when Redis is unavailable so the
+        caller falls back to the synchronous UPDATE
+    """
+    client = get_schedule_redis()
+    if client is None:
+        return False
+    try:
+        key = f'lead_reply:{lead_id}'
+        pipe = client.pipeline()
+        pipe.hincrby(key, 'count', 1)
+        pipe.hsetnx(key, 'first_replied_at', now.isoformat())
+        pipe.hset(key, 'last_replied_at', now.isoformat())
+        pipe.expire(key, PIXEL_BUFFER_TTL)
+        pipe.sadd(REPLY_DIRTY_SET, str(lead_id))
+        pipe.execute()
+        return True
+    except Exception as e:
+        logger.warning(f"Lead reply buffer failed: {e}")
+        return False
+
 
 class EmailTracker:
     """
@@ -49,9 +210,7 @@ class EmailTracker:
             )
             
             # Build pixel URL
-            tracking_domain = settings.TRACKING_DOMAIN
-            tracking_protocol = settings.TRACKING_PROTOCOL
-            pixel_url = f"{tracking_protocol}://{tracking_domain}/api/track/open/{pixel.pixel_id}.png"
+            pixel_url = _tracking_prefixes()[0] + pixel.pixel_id + ".png"
             
             logger.info(f"Created tracking pixel {pixel.pixel_id} for lead {lead_id}")
             
@@ -84,9 +243,9 @@ class EmailTracker:
             )
             
             # Build tracking URL
-            tracking_domain = settings.TRACKING_DOMAIN
-            tracking_protocol = settings.TRACKING_PROTOCOL
-            tracking_url = f"{tracking_protocol}://{tracking_domain}/api/track/click/{click.click_id}"
+            tracking_url = _tracking_prefixes()[1] + click.click_id
+
+            _mirror_click_urls([(click.click_id, destination_url)])
             
             logger.debug(f"Created click tracking {click.click_id} for {destination_url[:50]}")
             
@@ -95,7 +254,49 @@ class EmailTracker:
         except Exception as e:
             logger.error(f"Error creating click tracking: {e}")
             return destination_url  # Return original URL as fallback
-    
+
+    @staticmethod
+    def create_click_tracking_bulk(lead_id, message_id, destination_urls, client_id):
+        """
+        Create click tracking records for many links in one INSERT
+
+        click_ids are generated client-side, so all rows go to the DB in
+        a single bulk_create instead of one round trip per link.
+
+        Args:
+            lead_id: UUID of the lead
+            message_id: Gmail message ID
+            destination_urls: List of original destination URLs
+            client_id: UUID of the client
+
+        Returns:
+            List of tracking URLs matching destination_urls order
+        """
+        if not destination_urls:
+            return []
+        try:
+            click_ids = _batch_token_urlsafe(len(destination_urls))
+            clicks = [
+                EmailClickTracking(
+                    lead_id=lead_id,
+                    message_id=message_id,
+                    click_id=click_id,
+                    destination_url=url
+                )
+                for click_id, url in zip(click_ids, destination_urls)
+            ]
+            EmailClickTracking.objects.bulk_create(clicks, batch_size=500)
+
+            _mirror_click_urls(
+                [(click.click_id, click.destination_url) for click in clicks]
+            )
+
+            click_prefix = _tracking_prefixes()[1]
+            return [click_prefix + click.click_id for click in clicks]
+        except Exception as e:
+            logger.error(f"Error bulk creating click tracking: {e}")
+            return list(destination_urls)  # Return original URLs as fallback
+
     @staticmethod
     def record_open(pixel_id, user_agent=None, ip_address=None, client_id=None):
         """
@@ -110,41 +311,80 @@ class EmailTracker:
         Returns:
             Boolean indicating success
         """
+        from django.db import connection
+
         try:
-            pixel = EmailTrackingPixel.objects.get(pixel_id=pixel_id)
-            
             now = timezone.now()
-            
-            # Update pixel record
-            if not pixel.opened:
-                pixel.opened = True
-                pixel.first_opened_at = now
-            
-            pixel.open_count += 1
-            pixel.last_opened_at = now
-            pixel.save()
-            
+            lead_id = message_id = None
+
+            # Hot path: buffer the counter write in Redis and let
+            # flush_pixel_events fold it into the pixel row in bulk.
+            # When Redis is down, fall back to the single atomic
+            # UPDATE (the DB does the increment in-place, so concurrent
+            # opens can't lose counts to a read-modify-write race).
+            buffered = buffer_pixel_open(pixel_id, now)
+            if not buffered:
+                if connection.vendor == 'postgresql':
+                    # RETURNING merges the counter write and the event
+                    # payload read into one round trip
+                    with connection.cursor() as cursor:
+                        cursor.execute("""
+                            UPDATE email_tracking_pixels
+                            SET opened = TRUE,
+                                open_count = open_count + 1,
+                                first_opened_at = COALESCE(first_opened_at, %s),
+                                last_opened_at = %s
+                            WHERE pixel_id = %s
+                            RETURNING lead_id, message_id
+                        """, [now, now, pixel_id])
+                        row = cursor.fetchone()
+                    if row is None:
+                        logger.warning(f"Tracking pixel not found: {pixel_id}")
+                        return False
+                    lead_id, message_id = row
+                else:
+                    updated = EmailTrackingPixel.objects.filter(pixel_id=pixel_id).update(
+                        opened=True,
+                        open_count=F('open_count') + 1,
+                        first_opened_at=Coalesce(F('first_opened_at'), Value(now)),
+                        last_opened_at=now
+                    )
+
+                    if not updated:
+                        logger.warning(f"Tracking pixel not found: {pixel_id}")
+                        return False
+
+            if lead_id is None:
+                # Small keyed read for the event payload only
+                pixel = EmailTrackingPixel.objects.only(
+                    'lead_id', 'message_id'
+                ).get(pixel_id=pixel_id)
+                lead_id, message_id = pixel.lead_id, pixel.message_id
+
             # Determine device type from user agent
             device_type = EmailTracker._parse_device_type(user_agent)
-            
-            # Create event record
-            EmailEvent.objects.create(
-                lead_id=pixel.lead_id,
-                client_id=client_id or pixel.lead_id,  # Fallback if client_id not provided
+
+            # Queue event record for the next bulk insert
+            event_batcher.add(EmailEvent(
+                lead_id=lead_id,
+                client_id=client_id or lead_id,  # Fallback if client_id not provided
                 event_type='OPEN',
-                message_id=pixel.message_id,
+                message_id=message_id,
                 user_agent=user_agent,
                 ip_address=ip_address,
                 device_type=device_type
-            )
-            
-            # Update lead metrics (direct SQL for performance)
-            EmailTracker._update_lead_open_metrics(pixel.lead_id, now)
-            
-            logger.info(f"Recorded open for pixel {pixel_id}, lead {pixel.lead_id}")
-            
+            ))
+
+            # Update lead metrics. Buffered opens skip this per-hit
+            # UPDATE: flush_pixel_events folds the aggregated deltas
+            # into the leads table alongside the pixel counters.
+            if not buffered:
+                EmailTracker._update_lead_open_metrics(lead_id, now)
+
+            logger.info(f"Recorded open for pixel {pixel_id}, lead {lead_id}")
+
             return True
-            
+
         except EmailTrackingPixel.DoesNotExist:
             logger.warning(f"Tracking pixel not found: {pixel_id}")
             return False
@@ -166,42 +406,77 @@ class EmailTracker:
         Returns:
             Dict with 'success' (bool) and 'destination_url' (str)
         """
+        from django.db import connection
+
         try:
-            click = EmailClickTracking.objects.get(click_id=click_id)
-            
             now = timezone.now()
-            
-            # Update click record
-            if click.click_count == 0:
-                click.first_clicked_at = now
-            
-            click.click_count += 1
-            click.last_clicked_at = now
-            click.save()
-            
+
+            if connection.vendor == 'postgresql':
+                # One round trip: atomic increment + payload/redirect
+                # read via RETURNING
+                with connection.cursor() as cursor:
+                    cursor.execute("""
+                        UPDATE email_click_tracking
+                        SET click_count = click_count + 1,
+                            first_clicked_at = COALESCE(first_clicked_at, %s),
+                            last_clicked_at = %s
+                        WHERE click_id = %s
+                        RETURNING lead_id, message_id, destination_url
+                    """, [now, now, click_id])
+                    row = cursor.fetchone()
+                if row is None:
+                    logger.warning(f"Click tracking not found: {click_id}")
+                    return {
+                        'success': False,
+                        'destination_url': '/'  # Fallback to homepage
+                    }
+                lead_id, message_id, destination_url = row
+            else:
+                # Single atomic UPDATE (same pattern as record_open)
+                updated = EmailClickTracking.objects.filter(click_id=click_id).update(
+                    click_count=F('click_count') + 1,
+                    first_clicked_at=Coalesce(F('first_clicked_at'), Value(now)),
+                    last_clicked_at=now
+                )
+
+                if not updated:
+                    logger.warning(f"Click tracking not found: {click_id}")
+                    return {
+                        'success': False,
+                        'destination_url': '/'  # Fallback to homepage
+                    }
+
+                # Small keyed read for the event payload and redirect target
+                click = EmailClickTracking.objects.only(
+                    'lead_id', 'message_id', 'destination_url'
+                ).get(click_id=click_id)
+                lead_id, message_id, destination_url = (
+                    click.lead_id, click.message_id, click.destination_url
+                )
+
             # Determine device type
             device_type = EmailTracker._parse_device_type(user_agent)
-            
-            # Create event record
-            EmailEvent.objects.create(
-                lead_id=click.lead_id,
-                client_id=client_id or click.lead_id,  # Fallback
+
+            # Queue event record for the next bulk insert
+            event_batcher.add(EmailEvent(
+                lead_id=lead_id,
+                client_id=client_id or lead_id,  # Fallback
                 event_type='CLICK',
-                message_id=click.message_id,
-                url=click.destination_url,
+                message_id=message_id,
+                url=destination_url,
                 user_agent=user_agent,
                 ip_address=ip_address,
                 device_type=device_type
-            )
-            
+            ))
+
             # Update lead metrics
-            EmailTracker._update_lead_click_metrics(click.lead_id, now)
-            
-            logger.info(f"Recorded click for {click_id}, lead {click.lead_id}")
-            
+            EmailTracker._update_lead_click_metrics(lead_id, now)
+
+            logger.info(f"Recorded click for {click_id}, lead {lead_id}")
+
             return {
                 'success': True,
-                'destination_url': click.destination_url
+                'destination_url': destination_url
             }
             
         except EmailClickTracking.DoesNotExist:
@@ -217,49 +492,99 @@ class EmailTracker:
                 'destination_url': '/'
             }
     
+    @staticmethod
+    def _is_trackable_href(url):
+        """True when an href should be rewritten to a tracking URL"""
+        if url.startswith(('mailto:', 'tel:', '#')):
+            return False
+        if 'track/click' in url:
+            return False
+        return True
+
+    @staticmethod
+    def _parse_links(html_body):
+        """
+        Parse an email body and collect its trackable <a> elements
+
+        lxml's C parser is an order of magnitude faster than
+        BeautifulSoup's html.parser on typical email bodies; bodies that
+        lxml chokes on fall back to BeautifulSoup, which is more
+        forgiving of broken markup.
+
+        Returns:
+            Tuple of (parsed document, list of link elements,
+            set_href(link, url) setter, serialize(document) function)
+        """
+        try:
+            tree = lxml.html.fromstring(html_body)
+            # descendant-or-self: a fragment whose root element is the
+            # anchor itself (fromstring doesn't wrap single elements)
+            # must still be found
+            links = [
+                link for link in tree.xpath('descendant-or-self::a[@href]')
+                if EmailTracker._is_trackable_href(link.get('href'))
+            ]
+
+            def set_href(link, url):
+                link.set('href', url)
+
+            def serialize(doc):
+                return lxml.html.tostring(doc, encoding='unicode')
+
+            return tree, links, set_href, serialize
+        except Exception:
+            soup = BeautifulSoup(html_body, 'html.parser')
+            links = [
+                link for link in soup.find_all('a', href=True)
+                if EmailTracker._is_trackable_href(link['href'])
+            ]
+
+            def set_href(link, url):
+                link['href'] = url
+
+            return soup, links, set_href, str
+
+    @staticmethod
+    def _get_href(link):
+        """Read an href off either an lxml element or a bs4 tag"""
+        return link.get('href') if hasattr(link, 'iterfind') else link['href']
+
     @staticmethod
     def replace_links_with_tracking(html_body, lead_id, message_id, client_id):
         """
         Replace all links in HTML body with tracking URLs
-        
+
         Args:
             html_body: HTML email body
             lead_id: UUID of the lead
             message_id: Gmail message ID
             client_id: UUID of the client
-        
+
         Returns:
             Dict with 'html' (modified HTML) and 'tracked_links' (dict)
         """
+        # No anchors at all: skip the parse/serialize round-trip
+        if not _ANCHOR_RE.search(html_body):
+            return {'html': html_body, 'tracked_links': {}}
+
         try:
-            soup = BeautifulSoup(html_body, 'html.parser')
+            doc, links, set_href, serialize = EmailTracker._parse_links(html_body)
+
+            original_urls = [EmailTracker._get_href(link) for link in links]
+            tracking_urls = EmailTracker.create_click_tracking_bulk(
+                lead_id=lead_id,
+                message_id=message_id,
+                destination_urls=original_urls,
+                client_id=client_id
+            )
+
+            # Swap hrefs for the generated tracking URLs
             tracked_links = {}
-            
-            # Find all <a> tags with href
-            for link in soup.find_all('a', href=True):
-                original_url = link['href']
-                
-                # Skip mailto: and tel: links
-                if original_url.startswith(('mailto:', 'tel:', '#')):
-                    continue
-                
-                # Skip already tracked links
-                if 'track/click' in original_url:
-                    continue
-                
-                # Create tracking URL
-                tracking_url = EmailTracker.create_click_tracking(
-                    lead_id=lead_id,
-                    message_id=message_id,
-                    destination_url=original_url,
-                    client_id=client_id
-                )
-                
-                # Replace in HTML
-                link['href'] = tracking_url
+            for link, original_url, tracking_url in zip(links, original_urls, tracking_urls):
                 tracked_links[original_url] = tracking_url
-            
-            modified_html = str(soup)
+                set_href(link, tracking_url)
+
+            modified_html = serialize(doc)
             
             logger.info(f"Replaced {len(tracked_links)} links with tracking for lead {lead_id}")
             
@@ -276,39 +601,114 @@ class EmailTracker:
                 'tracked_links': {}
             }
     
+    _PIXEL_PLACEHOLDER_IMG = (
+        '<img src="__PIXEL_URL__" width="1" height="1" style="display:none;" alt="" />'
+    )
+
     @staticmethod
-    def add_tracking_to_email(html_body, lead_id, message_id, client_id):
+    def prepare_template(html_body):
         """
-        Add both pixel tracking and link tracking to email HTML
-        
+        Parse an email body once into a placeholder tracking template
+
+        Trackable hrefs are swapped for __TRACK_n__ placeholders and a
+        __PIXEL_URL__ img is appended, so rendering a message from the
+        template is str.replace instead of a BeautifulSoup parse.
+
         Args:
             html_body: HTML email body
+
+        Returns:
+            Tuple of (template str, list of original link URLs)
+        """
+        # No anchors at all: only the pixel needs appending
+        if not _ANCHOR_RE.search(html_body):
+            return html_body + EmailTracker._PIXEL_PLACEHOLDER_IMG, []
+
+        try:
+            doc, links, set_href, serialize = EmailTracker._parse_links(html_body)
+            urls = []
+
+            for link in links:
+                urls.append(EmailTracker._get_href(link))
+                set_href(link, f'__TRACK_{len(urls) - 1}__')
+
+            template = serialize(doc)
+        except Exception as e:
+            logger.error(f"Error preparing tracking template: {e}")
+            template, urls = html_body, []
+
+        return template + EmailTracker._PIXEL_PLACEHOLDER_IMG, urls
+
+    @staticmethod
+    def render_tracking(template, urls, lead_id, message_id, client_id):
+        """
+        Substitute per-lead tracking URLs into a prepared template
+
+        Args:
+            template: Template from prepare_template
+            urls: Original link URLs matching the template placeholders
             lead_id: UUID of the lead
             message_id: Gmail message ID
             client_id: UUID of the client
-        
+
         Returns:
             Modified HTML with tracking
         """
-        # Replace links with tracking
-        result = EmailTracker.replace_links_with_tracking(
-            html_body, lead_id, message_id, client_id
+        tracking_urls = EmailTracker.create_click_tracking_bulk(
+            lead_id=lead_id,
+            message_id=message_id,
+            destination_urls=urls,
+            client_id=client_id
         )
-        html_with_tracked_links = result['html']
-        
-        # Create tracking pixel
+        if tracking_urls:
+            # One scan over the template instead of one full-document
+            # str.replace per link
+            html = _TRACK_RE.sub(
+                lambda m: tracking_urls[int(m.group(1))], template
+            )
+        else:
+            html = template
+
         pixel_url = EmailTracker.create_tracking_pixel(
             lead_id, message_id, client_id
         )
-        
-        # Add pixel to HTML
         if pixel_url:
-            pixel_html = f'<img src="{pixel_url}" width="1" height="1" style="display:none;" alt="" />'
-            html_with_tracking = html_with_tracked_links + pixel_html
+            html = html.replace('__PIXEL_URL__', pixel_url)
         else:
-            html_with_tracking = html_with_tracked_links
-        
-        return html_with_tracking
+            html = html.replace(EmailTracker._PIXEL_PLACEHOLDER_IMG, '')
+
+        return html
+
+    @staticmethod
+    def add_tracking_to_email(html_body, lead_id, message_id, client_id):
+        """
+        Add both pixel tracking and link tracking to email HTML
+
+        Bodies repeat within a batch (same sequence step, same
+        template), so the parsed template is cached by body hash and
+        only the per-lead tracking URLs are substituted per message.
+
+        Args:
+            html_body: HTML email body
+            lead_id: UUID of the lead
+            message_id: Gmail message ID
+            client_id: UUID of the client
+
+        Returns:
+            Modified HTML with tracking
+        """
+        key = hashlib.sha1(html_body.encode()).hexdigest()
+        with _TEMPLATE_CACHE_LOCK:
+            prepared = _TEMPLATE_CACHE.get(key)
+        if prepared is None:
+            prepared = EmailTracker.prepare_template(html_body)
+            with _TEMPLATE_CACHE_LOCK:
+                _TEMPLATE_CACHE[key] = prepared
+
+        template, urls = prepared
+        return EmailTracker.render_tracking(
+            template, urls, lead_id, message_id, client_id
+        )
     
     # Private helper methods
     
@@ -325,14 +725,15 @@ class EmailTracker:
         """
         if not user_agent:
             return 'unknown'
-        
-        user_agent_lower = user_agent.lower()
-        
-        if any(device in user_agent_lower for device in ['iphone', 'android', 'mobile']):
+
+        # One regex scan over the UA instead of repeated substring walks
+        tokens = ua_tokens(user_agent)
+
+        if tokens & {'iphone', 'android', 'mobile'}:
             return 'mobile'
-        elif any(device in user_agent_lower for device in ['ipad', 'tablet']):
+        elif tokens & {'ipad', 'tablet'}:
             return 'tablet'
-        elif any(device in user_agent_lower for device in ['windows', 'mac', 'linux']):
+        elif tokens & {'windows', 'mac', 'linux'}:
             return 'desktop'
         else:
             return 'unknown'
@@ -359,6 +760,37 @@ class EmailTracker:
         except Exception as e:
             logger.error(f"Error updating lead open metrics: {e}")
     
+    @staticmethod
+    def flush_lead_open_metrics(rows):
+        """
+        Apply aggregated open deltas to leads in one statement
+
+        Bulk counterpart of _update_lead_open_metrics used by the pixel
+        flush task: K buffered opens become a single
+        UPDATE ... FROM (VALUES ...) instead of K round trips.
+
+        Args:
+            rows: List of (lead_id str, delta int, seen_at iso-str)
+        """
+        if not rows:
+            return
+        try:
+            from psycopg2.extras import execute_values
+            with get_aisdr_connection().cursor() as cursor:
+                execute_values(cursor, """
+                    UPDATE leads
+                    SET emails_opened = emails_opened + data.delta,
+                        first_opened_at = COALESCE(
+                            first_opened_at, data.seen_at::timestamptz
+                        ),
+                        last_engagement_type = 'OPEN',
+                        last_engagement_at = data.seen_at::timestamptz
+                    FROM (VALUES %s) AS data(id, delta, seen_at)
+                    WHERE leads.id = data.id::uuid
+                """, rows, page_size=500)
+        except Exception as e:
+            logger.error(f"Error flushing lead open metrics: {e}")
+
     @staticmethod
     def _update_lead_click_metrics(lead_id, timestamp):
         """
@@ -393,7 +825,14 @@ class TrackingPixelGenerator:
         b'\x08\x02\x00\x00\x00\x90wS\xde\x00\x00\x00\x0cIDATx\x9cc\x00\x01'
         b'\x00\x00\x05\x00\x01\r\n-\xb4\x00\x00\x00\x00IEND\xaeB`\x82'
     )
-    
+
+    # Strong ETag for the (immutable) pixel bytes, computed once at
+    # import. must-revalidate keeps clients hitting the endpoint (the
+    # open is recorded on the revalidation request), but repeat opens
+    # get an empty 304 instead of re-downloading the body.
+    PIXEL_ETAG = '"' + hashlib.md5(TRANSPARENT_PIXEL).hexdigest() + '"'
+
+
     @staticmethod
     def get_pixel():
         """
@@ -414,7 +853,8 @@ class TrackingPixelGenerator:
         """
         return {
             'Content-Type': 'image/png',
-            'Cache-Control': 'no-cache, no-store, must-revalidate',
+            'Cache-Control': 'private, max-age=0, must-revalidate',
+            'ETag': TrackingPixelGenerator.PIXEL_ETAG,
             'Pragma': 'no-cache',
             'Expires': '0'
         }
@@ -13,6 +13,7 @@ urlpatterns = [
     
     # Tracking endpoints
     path('track/open/<str:pixel_id>.png', views.track_open, name='track_open'),
+    path('track/open-beacon/<str:pixel_id>', views.track_open_beacon, name='track_open_beacon'),
     path('track/click/<str:click_id>', views.track_click, name='track_click'),
     path('track/reply', views.track_reply, name='track_reply'),
     
@@ -26,6 +27,7 @@ urlpatterns = [
     # Client Dashboard endpoints
     path('client/login', views.client_login, name='client_login'),
     path('client/logout', views.client_logout, name='client_logout'),
+    path('client/dashboard', views.get_client_dashboard, name='client_dashboard'),
     path('client/stats', views.get_client_stats, name='client_stats'),
     path('client/campaigns', views.get_client_campaigns, name='client_campaigns'),
     path('client/replies', views.get_client_replies, name='client_replies'),
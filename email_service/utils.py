@@ -1,20 +1,61 @@
 """
 Utility functions and decorators for email service
 """
-from functools import wraps
+import hmac
+import re
+import threading
+from functools import lru_cache, wraps
+from cachetools import TTLCache
 from django.conf import settings
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
 from rest_framework.response import Response
 from rest_framework import status
 import logging
-from django.db import connections, connection as default_connection
+from django.db import connections, connection as default_connection, close_old_connections, reset_queries
 
 logger = logging.getLogger(__name__)
 
 
+def plug_db_leaks(func):
+    """
+    Connection hygiene for long-lived worker code
+
+    Celery workers never see Django's request_finished signal, so stale
+    connections and (in DEBUG) the per-connection query log accumulate
+    across task runs - and cursors holding large TEXT values
+    (email_body, reply_content) pin that memory. Closes aged
+    connections and clears the query log after each call.
+    """
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        try:
+            return func(*args, **kwargs)
+        finally:
+            close_old_connections()
+            reset_queries()
+    return wrapper
+
+
+@lru_cache(maxsize=1)
+def _expected_api_key():
+    """
+    The configured API key as bytes, read from settings once
+
+    Returns None when no key is configured (unset or empty) - callers
+    must treat that as "reject everything", not pass it to
+    compare_digest.
+    """
+    key = settings.OREE_API_KEY
+    if isinstance(key, str):
+        key = key.encode()
+    return key or None
+
+
 def require_api_key(view_func):
     """
     Decorator to require API key authentication for endpoints
-    
+
     Expects Authorization header with format: Bearer <API_KEY>
     """
     @wraps(view_func)
@@ -36,10 +77,14 @@ def require_api_key(view_func):
                 status=status.HTTP_401_UNAUTHORIZED
             )
         
+        # Constant-time compare against the cached key bytes: no lazy
+        # settings lookup per request, no timing side-channel
         provided_key = parts[1]
-        expected_key = settings.OREE_API_KEY
-        
-        if provided_key != expected_key:
+
+        expected_key = _expected_api_key()
+        if expected_key is None or not hmac.compare_digest(
+            provided_key.encode(), expected_key
+        ):
             logger.warning(f"Invalid API key attempt from {get_client_ip(request)}")
             return Response(
                 {'error': 'Invalid API key'},
@@ -62,69 +107,129 @@ def get_client_ip(request):
     Returns:
         IP address as string
     """
-    # Check for X-Forwarded-For header (proxy/load balancer)
+    # Check for X-Forwarded-For header (proxy/load balancer);
+    # partition avoids allocating a list just to take the first entry
     x_forwarded_for = request.META.get('HTTP_X_FORWARDED_FOR')
     if x_forwarded_for:
-        ip = x_forwarded_for.split(',')[0].strip()
+        ip = x_forwarded_for.partition(',')[0].strip()
     else:
         ip = request.META.get('REMOTE_ADDR')
-    
+
     return ip
 
 
-def parse_user_agent(user_agent):
+def get_request_client_info(request):
     """
-    Parse user agent string into components
-    
+    User agent and client IP from one pass over request.META
+
+    Single-lookup variant of HTTP_USER_AGENT + get_client_ip for the
+    tracking handlers, where these two reads are most of the
+    per-request Python work.
+
+    Returns:
+        Tuple of (user_agent str, ip str or None)
+    """
+    meta = request.META
+    x_forwarded_for = meta.get('HTTP_X_FORWARDED_FOR')
+    if x_forwarded_for:
+        ip = x_forwarded_for.partition(',')[0].strip()
+    else:
+        ip = meta.get('REMOTE_ADDR')
+    return meta.get('HTTP_USER_AGENT', ''), ip
+
+
+# Every marker the UA heuristics care about, matched in one pass. The
+# old code re-scanned the string with `in` for each candidate; one
+# compiled regex scan plus set lookups does the same classification
+# with a single walk over the UA.
+_UA_RE = re.compile(
+    r'(iphone|ipad|android|mobile|tablet|windows|mac|linux|ios|'
+    r'chrome|firefox|safari|edge)',
+    re.IGNORECASE,
+)
+
+
+@lru_cache(maxsize=4096)
+def ua_tokens(user_agent):
+    """
+    Extract the known user-agent markers in a single regex scan
+
+    User agents repeat heavily across a campaign's recipients (same
+    mail clients, same proxies), so results are memoized - dominant UAs
+    cost a dict hit instead of a regex pass.
+
     Args:
-        user_agent: User agent string
-    
+        user_agent: User agent string (may be None)
+
     Returns:
-        Dict with browser, os, device info
+        Frozenset of lowercase marker tokens found in the string
     """
-    if not user_agent:
-        return {
-            'browser': 'Unknown',
-            'os': 'Unknown',
-            'device': 'Unknown'
-        }
-    
-    user_agent_lower = user_agent.lower()
-    
-    # Detect browser
-    if 'chrome' in user_agent_lower:
+    return frozenset(m.lower() for m in _UA_RE.findall(user_agent or ''))
+
+
+@lru_cache(maxsize=4096)
+def _classify_user_agent(user_agent):
+    """Cached UA classification; returns (browser, os, device)"""
+    tokens = ua_tokens(user_agent)
+
+    # Detect browser (priority order matters: Chrome UAs also contain
+    # "safari", so the checks mirror the original elif chain)
+    if 'chrome' in tokens:
         browser = 'Chrome'
-    elif 'firefox' in user_agent_lower:
+    elif 'firefox' in tokens:
         browser = 'Firefox'
-    elif 'safari' in user_agent_lower:
+    elif 'safari' in tokens:
         browser = 'Safari'
-    elif 'edge' in user_agent_lower:
+    elif 'edge' in tokens:
         browser = 'Edge'
     else:
         browser = 'Other'
-    
+
     # Detect OS
-    if 'windows' in user_agent_lower:
+    if 'windows' in tokens:
         os_name = 'Windows'
-    elif 'mac' in user_agent_lower:
+    elif 'mac' in tokens:
         os_name = 'macOS'
-    elif 'linux' in user_agent_lower:
+    elif 'linux' in tokens:
         os_name = 'Linux'
-    elif 'android' in user_agent_lower:
+    elif 'android' in tokens:
         os_name = 'Android'
-    elif 'ios' in user_agent_lower or 'iphone' in user_agent_lower or 'ipad' in user_agent_lower:
+    elif tokens & {'ios', 'iphone', 'ipad'}:
         os_name = 'iOS'
     else:
         os_name = 'Other'
-    
+
     # Detect device type
-    if any(device in user_agent_lower for device in ['iphone', 'android', 'mobile']):
+    if tokens & {'iphone', 'android', 'mobile'}:
         device = 'Mobile'
-    elif any(device in user_agent_lower for device in ['ipad', 'tablet']):
+    elif tokens & {'ipad', 'tablet'}:
         device = 'Tablet'
     else:
         device = 'Desktop'
-    
+
+    return browser, os_name, device
+
+
+def parse_user_agent(user_agent):
+    """
+    Parse user agent string into components
+
+    Args:
+        user_agent: User agent string
+
+    Returns:
+        Dict with browser, os, device info
+    """
+    if not user_agent:
+        return {
+            'browser': 'Unknown',
+            'os': 'Unknown',
+            'device': 'Unknown'
+        }
+
+    # The cached helper returns an immutable tuple; build a fresh dict
+    # per call so callers can't mutate a shared cache entry
+    browser, os_name, device = _classify_user_agent(user_agent)
     return {
         'browser': browser,
         'os': os_name,
@@ -156,27 +261,31 @@ def get_next_mailbox_token(client_id):
         ValueError: If no active tokens found for client
     """
     from .models import GmailToken
+    from django.db import transaction
+    from django.db.models import F
     from django.utils import timezone
-    
-    # Get all active tokens for this client, ordered by least recently used
-    tokens = GmailToken.objects.filter(
-        client_id=client_id,
-        status='active'
-    ).order_by('last_used_at')  # Nulls first (never used), then oldest first
-    
-    if not tokens.exists():
-        logger.error(f"No active Gmail tokens found for client {client_id}")
-        raise ValueError(f"No active Gmail tokens for client {client_id}. Please complete OAuth setup.")
-    
-    # Get the least recently used token
-    next_token = tokens.first()
-    
-    # Update last_used_at timestamp
-    next_token.last_used_at = timezone.now()
-    next_token.save(update_fields=['last_used_at'])
-    
+
+    # Lock the chosen row for the duration of the claim so two senders
+    # rotating at the same time pick different mailboxes (SKIP LOCKED:
+    # a contended row is skipped, not waited on - same pattern as
+    # EmailSendQueue.claim_batch)
+    with transaction.atomic():
+        next_token = GmailToken.objects.select_for_update(skip_locked=True).filter(
+            client_id=client_id,
+            status='active'
+        ).order_by(
+            F('last_used_at').asc(nulls_first=True)  # Never used first, then oldest
+        ).first()
+
+        if next_token is None:
+            logger.error(f"No active Gmail tokens found for client {client_id}")
+            raise ValueError(f"No active Gmail tokens for client {client_id}. Please complete OAuth setup.")
+
+        # Single targeted UPDATE instead of fetch-then-save
+        GmailToken.objects.filter(pk=next_token.pk).update(last_used_at=timezone.now())
+
     logger.info(f"Selected mailbox {next_token.email_address} for client {client_id}")
-    
+
     return next_token
 
 
@@ -194,9 +303,43 @@ def get_mailbox_with_capacity(client_id):
         ValueError: If all mailboxes at limit
     """
     from .models import GmailToken
+    from django.db import connection
     from django.db.models import F
-    
-    # Find tokens with remaining capacity
+
+    # Postgres: selection and reservation collapse into one statement.
+    # The subselect picks the best candidate under FOR UPDATE SKIP
+    # LOCKED (contended rows go to the next worker, not the same one)
+    # and the UPDATE increments the counter in the same round trip.
+    if connection.vendor == 'postgresql':
+        with connection.cursor() as cursor:
+            cursor.execute("""
+                UPDATE gmail_tokens
+                SET daily_send_count = daily_send_count + 1,
+                    last_used_at = NOW()
+                WHERE id = (
+                    SELECT id FROM gmail_tokens
+                    WHERE client_id = %s
+                      AND status = 'active'
+                      AND daily_send_count < daily_send_limit
+                    ORDER BY (daily_send_limit - daily_send_count) DESC,
+                             last_used_at ASC NULLS FIRST
+                    LIMIT 1
+                    FOR UPDATE SKIP LOCKED
+                )
+                RETURNING id
+            """, [str(client_id)])
+            row = cursor.fetchone()
+
+        if row is None:
+            logger.warning(f"All mailboxes at daily limit for client {client_id}")
+            raise ValueError(f"All mailboxes have reached daily send limit for client {client_id}")
+
+        next_token = GmailToken.objects.get(pk=row[0])
+        logger.info(f"Selected mailbox {next_token.email_address} for client {client_id}")
+        return next_token
+
+    # Fallback (non-Postgres): snapshot candidates, then rotate until a
+    # conditional UPDATE wins
     tokens = GmailToken.objects.filter(
         client_id=client_id,
         status='active'
@@ -205,15 +348,42 @@ def get_mailbox_with_capacity(client_id):
     ).filter(
         remaining__gt=0  # Has capacity remaining
     ).order_by('-remaining', 'last_used_at')  # Most capacity first, then least recently used
-    
-    if not tokens.exists():
-        logger.warning(f"All mailboxes at daily limit for client {client_id}")
-        raise ValueError(f"All mailboxes have reached daily send limit for client {client_id}")
-    
-    next_token = tokens.first()
-    logger.info(f"Selected mailbox {next_token.email_address} ({next_token.remaining} remaining) for client {client_id}")
-    
-    return next_token
+
+    for next_token in tokens:
+        if reserve_mailbox_capacity(next_token):
+            logger.info(f"Selected mailbox {next_token.email_address} ({next_token.remaining} remaining) for client {client_id}")
+            return next_token
+
+    logger.warning(f"All mailboxes at daily limit for client {client_id}")
+    raise ValueError(f"All mailboxes have reached daily send limit for client {client_id}")
+
+
+def reserve_mailbox_capacity(token):
+    """
+    Atomically reserve one send against a mailbox's daily limit
+
+    A single conditional UPDATE acts as combined check-and-increment:
+    the WHERE clause only matches while the mailbox is under its limit,
+    so concurrent workers can never push daily_send_count past
+    daily_send_limit (no read-modify-write race).
+
+    Args:
+        token: GmailToken instance
+
+    Returns:
+        True if a send slot was reserved, False if the mailbox is at cap
+    """
+    from .models import GmailToken
+    from django.db.models import F
+    from django.utils import timezone
+
+    return GmailToken.objects.filter(
+        id=token.id,
+        daily_send_count__lt=F('daily_send_limit')
+    ).update(
+        daily_send_count=F('daily_send_count') + 1,
+        last_used_at=timezone.now()
+    ) == 1
 
 
 def reset_daily_send_counts():
@@ -229,6 +399,48 @@ def reset_daily_send_counts():
     return updated
 
 
+# Per-process cache for active GmailToken rows. The send path re-reads
+# the same handful of (client, mailbox) tokens hundreds of times per
+# day; 30s of staleness is harmless because writes evict via signals.
+_token_cache = TTLCache(maxsize=1024, ttl=30)
+_token_cache_lock = threading.Lock()
+
+
+def get_active_gmail_token(client_id, email_address):
+    """
+    Fetch an active GmailToken by (client_id, email_address), cached
+
+    Raises:
+        GmailToken.DoesNotExist: If there is no active token
+    """
+    from .models import GmailToken
+
+    key = (str(client_id), email_address)
+    with _token_cache_lock:
+        token = _token_cache.get(key)
+    if token is not None:
+        return token
+
+    token = GmailToken.objects.get(
+        client_id=client_id,
+        email_address=email_address,
+        status='active'
+    )
+    with _token_cache_lock:
+        _token_cache[key] = token
+    return token
+
+
+@receiver(post_save, sender='email_service.GmailToken')
+@receiver(post_delete, sender='email_service.GmailToken')
+def _evict_gmail_token(sender, instance, **kwargs):
+    """Drop the cached entries whenever a token row changes"""
+    with _token_cache_lock:
+        _token_cache.pop((str(instance.client_id), instance.email_address), None)
+    from .gmail_client import GmailClientFactory
+    GmailClientFactory.evict(instance.id)
+
+
 def get_or_assign_mailbox_for_lead(lead_id, client_id):
     """
     Get the assigned mailbox for a lead, or assign one if not exists.
@@ -253,8 +465,38 @@ def get_or_assign_mailbox_for_lead(lead_id, client_id):
         Exception: If no active mailboxes found for client
     """
     from .models import LeadMailboxAssignment, GmailToken
+    from django.db.models import F
     from django.utils import timezone
-    
+
+    # Fast path: the sticky mapping is effectively immutable for the
+    # lead's lifetime, so it lives in Redis (30 days). A hit skips the
+    # assignment lookup entirely; the token read is the 30s TTLCache.
+    # Stale entries self-heal: an inactive mailbox fails the active
+    # token lookup, the key is dropped and the slow path reassigns.
+    mbx_key = f'mbx:{client_id}:{lead_id}'
+    redis_client = get_schedule_redis()
+    if redis_client is not None:
+        try:
+            cached_email = redis_client.get(mbx_key)
+        except Exception:
+            cached_email = None
+        if cached_email:
+            cached_email = cached_email.decode()
+            try:
+                token = get_active_gmail_token(client_id, cached_email)
+                LeadMailboxAssignment.objects.filter(
+                    lead_id=lead_id, client_id=client_id, status='active'
+                ).update(
+                    last_used_at=timezone.now(),
+                    email_count=F('email_count') + 1
+                )
+                return token
+            except GmailToken.DoesNotExist:
+                try:
+                    redis_client.delete(mbx_key)
+                except Exception:
+                    pass
+
     # Check if lead already has an assigned mailbox
     try:
         assignment = LeadMailboxAssignment.objects.get(
@@ -263,20 +505,24 @@ def get_or_assign_mailbox_for_lead(lead_id, client_id):
             status='active'
         )
         
-        # Verify the mailbox is still active
+        # Verify the mailbox is still active (cached, 30s TTL)
         try:
-            token = GmailToken.objects.get(
-                email_address=assignment.assigned_email,
-                client_id=client_id,
-                status='active'
+            token = get_active_gmail_token(client_id, assignment.assigned_email)
+
+            # Update usage stats with one atomic UPDATE; the F()
+            # increment can't lose counts to concurrent sends
+            LeadMailboxAssignment.objects.filter(pk=assignment.pk).update(
+                last_used_at=timezone.now(),
+                email_count=F('email_count') + 1
             )
-            
-            # Update usage stats
-            assignment.last_used_at = timezone.now()
-            assignment.email_count += 1
-            assignment.save(update_fields=['last_used_at', 'email_count'])
-            
-            logger.info(f"Using existing mailbox {token.email_address} for lead {lead_id} (email #{assignment.email_count})")
+
+            if redis_client is not None:
+                try:
+                    redis_client.setex(mbx_key, 30 * 86400, token.email_address)
+                except Exception:
+                    pass
+
+            logger.info(f"Using existing mailbox {token.email_address} for lead {lead_id} (email #{assignment.email_count + 1})")
             return token
             
         except GmailToken.DoesNotExist:
@@ -304,11 +550,223 @@ def get_or_assign_mailbox_for_lead(lead_id, client_id):
         email_count=1,
         status='active'
     )
-    
+
+    if redis_client is not None:
+        try:
+            redis_client.setex(mbx_key, 30 * 86400, token.email_address)
+        except Exception:
+            pass
+
     logger.info(f"Assigned new mailbox {token.email_address} to lead {lead_id}")
     return token
 
 
+def resolve_mailboxes_for_leads(lead_client_pairs):
+    """
+    Resolve sticky mailbox assignments for a whole batch in two queries
+
+    Replaces the per-lead get_or_assign_mailbox_for_lead round-trips in
+    the batch send loop: one IN (...) fetch of existing active
+    assignments, one fetch of the involved clients' active tokens.
+    Leads with no (or stale) assignment get a round-robin pick from
+    their client's active mailboxes. Nothing is written here — callers
+    persist assignments for successful sends via
+    LeadMailboxAssignment.touch_bulk, whose upsert also creates the new
+    rows.
+
+    Args:
+        lead_client_pairs: iterable of (lead_id, client_id) tuples
+
+    Returns:
+        dict mapping (lead_id str, client_id str) -> GmailToken; pairs
+        whose client has no active mailbox are absent
+    """
+    from collections import defaultdict
+    from .models import LeadMailboxAssignment, GmailToken
+
+    pairs = {(str(lead), str(client)) for lead, client in lead_client_pairs}
+    if not pairs:
+        return {}
+
+    assigned = {
+        (str(lead), str(client)): email
+        for lead, client, email in LeadMailboxAssignment.objects.filter(
+            lead_id__in=[lead for lead, _ in pairs],
+            status='active'
+        ).values_list('lead_id', 'client_id', 'assigned_email')
+    }
+
+    tokens_by_client = defaultdict(list)
+    token_by_address = {}
+    for token in GmailToken.objects.filter(
+        client_id__in={client for _, client in pairs},
+        status='active'
+    ).order_by('last_used_at'):
+        tokens_by_client[str(token.client_id)].append(token)
+        token_by_address[(str(token.client_id), token.email_address)] = token
+
+    resolved = {}
+    rotation = defaultdict(int)
+    for lead, client in pairs:
+        address = assigned.get((lead, client))
+        # An address pointing at an inactive/removed token falls through
+        # to reassignment, mirroring the single-lead path
+        token = token_by_address.get((client, address)) if address else None
+        if token is None:
+            candidates = tokens_by_client.get(client)
+            if not candidates:
+                logger.error(f"No active Gmail tokens found for client {client}")
+                continue
+            token = candidates[rotation[client] % len(candidates)]
+            rotation[client] += 1
+        resolved[(lead, client)] = token
+
+    return resolved
+
+
+# ============================================
+# EMAIL SCHEDULE MIRROR (Redis sorted set)
+# ============================================
+
+# Postgres stays the source of truth for the send queue; a Redis zset
+# keyed by scheduled_for epoch lets the dispatcher pop ready ids in
+# O(log N) instead of scanning an ever-growing PENDING table every
+# minute. Everything degrades to the SQL path when Redis is absent.
+EMAIL_SCHED_KEY = 'email_sched'
+
+_sched_redis = None
+
+
+def get_schedule_redis():
+    """Redis client for the schedule mirror, or None when unconfigured"""
+    global _sched_redis
+    if _sched_redis is None:
+        url = getattr(settings, 'EMAIL_SCHED_REDIS_URL', None)
+        if not url:
+            return None
+        import redis
+        _sched_redis = redis.Redis.from_url(url)
+    return _sched_redis
+
+
+def schedule_queue_ids(pairs):
+    """
+    Mirror (queue_id, scheduled_for) pairs into the schedule zset
+
+    Best-effort: a Redis hiccup only costs scheduling latency because
+    the SQL reconciliation job re-hydrates the zset from PENDING rows.
+
+    Args:
+        pairs: iterable of (queue_id, scheduled_for datetime) tuples
+    """
+    client = get_schedule_redis()
+    if client is None:
+        return
+    mapping = {str(pk): scheduled_for.timestamp() for pk, scheduled_for in pairs}
+    if not mapping:
+        return
+    try:
+        client.zadd(EMAIL_SCHED_KEY, mapping)
+    except Exception as e:
+        logger.warning(f"Schedule mirror zadd failed: {e}")
+
+
+def reserve_client_daily_send(client_id):
+    """
+    Reserve one send against the client's daily cap via Redis INCR
+
+    A date-scoped counter acts as a cross-worker token bucket: the
+    check-and-increment costs one Redis round-trip (~50us) instead of a
+    row-locked UPDATE on the shared clients table, and it stays correct
+    when several shard batches send for the same client concurrently.
+    The daily limit is cached for 5 minutes and a 60s "exceeded" flag
+    short-circuits even the INCR once a client is over. Postgres keeps
+    the authoritative emails_sent_today counter via the existing batch
+    flush; this is only the hot-path gate.
+
+    Returns:
+        True if a send slot was reserved, False if the client is at its
+        cap, or None when Redis is unavailable (caller falls back to
+        the Postgres check)
+    """
+    from django.utils import timezone
+
+    client = get_schedule_redis()
+    if client is None:
+        return None
+
+    cid = str(client_id)
+    sent_key = f"client:{cid}:sent:{timezone.now().strftime('%Y%m%d')}"
+    try:
+        if client.get(f'client:{cid}:exceeded'):
+            return False
+
+        limit = client.get(f'client:{cid}:limit')
+        if limit is None:
+            with get_aisdr_connection().cursor() as cursor:
+                cursor.execute(
+                    "SELECT gmail_daily_limit FROM clients WHERE id = %s", [cid]
+                )
+                row = cursor.fetchone()
+            if not row:
+                return False
+            limit = row[0]
+            client.setex(f'client:{cid}:limit', 300, int(limit))
+
+        value, _ = client.pipeline().incr(sent_key).expire(sent_key, 172800).execute()
+        if value > int(limit):
+            client.pipeline().decr(sent_key).setex(
+                f'client:{cid}:exceeded', 60, 1
+            ).execute()
+            return False
+        return True
+    except Exception as e:
+        logger.warning(f"Redis daily-limit guard failed: {e}")
+        return None
+
+
+def release_client_daily_send(client_id):
+    """Return a reserved daily-send slot (e.g. the Gmail call failed)"""
+    from django.utils import timezone
+
+    client = get_schedule_redis()
+    if client is None:
+        return
+    try:
+        client.decr(
+            f"client:{str(client_id)}:sent:{timezone.now().strftime('%Y%m%d')}"
+        )
+    except Exception as e:
+        logger.warning(f"Redis daily-limit release failed: {e}")
+
+
+def pop_due_queue_ids(limit=1000):
+    """
+    Pop up to `limit` queue ids whose scheduled time has passed
+
+    Returns:
+        List of queue id strings, or None when Redis is unavailable so
+        the caller falls back to the SQL scan. A concurrent pop racing
+        on the same members is harmless: the DB claim (PENDING ->
+        SENDING) is the real gate against double sends.
+    """
+    import time
+
+    client = get_schedule_redis()
+    if client is None:
+        return None
+    try:
+        members = client.zrangebyscore(
+            EMAIL_SCHED_KEY, '-inf', time.time(), start=0, num=limit
+        )
+        if members:
+            client.zrem(EMAIL_SCHED_KEY, *members)
+        return [m.decode() for m in members]
+    except Exception as e:
+        logger.warning(f"Schedule mirror pop failed: {e}")
+        return None
+
+
 # ============================================
 # CLIENT AUTHENTICATION (JWT)
 # ============================================
@@ -343,19 +801,41 @@ def generate_client_jwt(client_id, company_name, tier, email):
     return token
 
 
+# Verified-token cache: a dashboard session replays the same bearer
+# token on every poll, so the HMAC check + JSON decode only needs to
+# happen once per token per process. Keyed by a short hash (not the
+# token itself) and re-checked against exp on every hit.
+_jwt_cache = TTLCache(maxsize=10000, ttl=300)
+_jwt_cache_lock = threading.Lock()
+
+
 def verify_client_jwt(token):
     """
-    Verify and decode JWT token
-    
+    Verify and decode JWT token (cached per token)
+
     Args:
         token: JWT token string
-    
+
     Returns:
         Payload dict if valid, None if invalid/expired
     """
+    import hashlib
+    import time
+
+    key = hashlib.blake2b(token.encode(), digest_size=16).digest()
+    with _jwt_cache_lock:
+        payload = _jwt_cache.get(key)
+    if payload is not None:
+        # Expiry still applies between cache hits
+        if payload.get('exp', 0) > time.time():
+            return payload
+        with _jwt_cache_lock:
+            _jwt_cache.pop(key, None)
+        logger.warning("JWT token expired")
+        return None
+
     try:
         payload = jwt.decode(token, settings.JWT_SECRET_KEY, algorithms=[settings.JWT_ALGORITHM])
-        return payload
     except jwt.ExpiredSignatureError:
         logger.warning("JWT token expired")
         return None
@@ -363,6 +843,10 @@ def verify_client_jwt(token):
         logger.warning(f"Invalid JWT token: {e}")
         return None
 
+    with _jwt_cache_lock:
+        _jwt_cache[key] = payload
+    return payload
+
 
 def require_client_auth(view_func):
     """
@@ -393,7 +877,7 @@ def require_client_auth(view_func):
         request.client_tier = payload['tier']
         request.client_email = payload['email']
         
-        logger.info(f"Authenticated client: {payload['company_name']} ({payload['client_id']})")
+        logger.debug("Authenticated client: %s (%s)", payload['company_name'], payload['client_id'])
         
         return view_func(request, *args, **kwargs)
     
@@ -0,0 +1,224 @@
+"""
+Partition the email_events table by month (PostgreSQL only)
+Run: python partition_email_events.py convert   # one-time table swap
+     python partition_email_events.py ensure    # precreate upcoming partitions
+
+`convert` swaps email_events for a declaratively range-partitioned
+table (partition key: created_at) so every insert/lookup only touches
+the current month's indexes and old months can be detached/archived
+cheaply. `ensure` precreates the current and next month's partitions
+and is safe to run from cron/beat. The EmailEvent model stays
+managed=True so the dev/test (sqlite) schema is unaffected - the swap
+is a DBA operation, not a migration.
+"""
+
+import os
+import sys
+import django
+from datetime import date
+from pathlib import Path
+
+# Setup Django
+BASE_DIR = Path(__file__).resolve().parent
+sys.path.append(str(BASE_DIR))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'OreeStats.settings')
+django.setup()
+
+from django.db import connection, transaction
+
+
+def _month_start(d):
+    return date(d.year, d.month, 1)
+
+
+def _next_month(d):
+    if d.month == 12:
+        return date(d.year + 1, 1, 1)
+    return date(d.year, d.month + 1, 1)
+
+
+def _partition_name(month):
+    return f"email_events_{month:%Y_%m}"
+
+
+def ensure_partitions(cursor, months):
+    """Create monthly partitions (idempotent)"""
+    for month in months:
+        name = _partition_name(month)
+        cursor.execute(f"""
+            CREATE TABLE IF NOT EXISTS {name}
+            PARTITION OF email_events
+            FOR VALUES FROM ('{month}') TO ('{_next_month(month)}')
+        """)
+        _ensure_reply_unique_index(cursor, name)
+        print(f"✅ Partition {name} ready")
+
+
+def _ensure_reply_unique_index(cursor, partition):
+    """
+    Per-partition version of email_events_reply_msgid_uniq
+
+    A unique index on the partitioned parent would have to include
+    created_at (the partition key), which defeats its purpose, so each
+    partition gets its own partial unique on message_id. Uniqueness is
+    only enforced within a month; cross-month redeliveries are caught by
+    the application-side dedupe in track_reply and
+    process_potential_replies.
+    """
+    cursor.execute(f"""
+        CREATE UNIQUE INDEX IF NOT EXISTS {partition}_reply_msgid_uniq
+        ON {partition} (message_id)
+        WHERE event_type = 'REPLY'
+    """)
+
+
+def convert():
+    """
+    One-time conversion of email_events to a partitioned table
+
+    Creates a partitioned copy, moves all rows, and swaps the names in
+    one transaction. Takes an exclusive lock for the duration - run it
+    in a maintenance window.
+
+    email_event_bodies keeps no foreign key afterwards: its old FK
+    targets the renamed table and PostgreSQL cannot reference a
+    partitioned table by id alone (the PK must include created_at), so
+    the constraint is dropped and integrity stays with the application
+    (bodies are only ever inserted alongside their event row).
+    """
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute("""
+            SELECT count(*) FROM pg_partitioned_table pt
+            JOIN pg_class c ON c.oid = pt.partrelid
+            WHERE c.relname = 'email_events'
+        """)
+        if cursor.fetchone()[0]:
+            print("✅ email_events is already partitioned")
+            return
+
+        print("Converting email_events to monthly range partitions...")
+
+        cursor.execute("""
+            CREATE TABLE email_events_part
+            (LIKE email_events INCLUDING DEFAULTS INCLUDING CONSTRAINTS
+             INCLUDING STORAGE)
+            PARTITION BY RANGE (created_at)
+        """)
+        # The PK must include the partition key on a partitioned table
+        cursor.execute("""
+            ALTER TABLE email_events_part
+            ADD PRIMARY KEY (id, created_at)
+        """)
+
+        # Partitions spanning existing data plus the next month
+        cursor.execute("""
+            SELECT min(created_at)::date, max(created_at)::date
+            FROM email_events
+        """)
+        first, last = cursor.fetchone()
+        month = _month_start(first or date.today())
+        end = _next_month(_month_start(last or date.today()))
+
+        months = []
+        while month <= end:
+            months.append(month)
+            month = _next_month(month)
+
+        for m in months:
+            cursor.execute(f"""
+                CREATE TABLE {_partition_name(m)}_new
+                PARTITION OF email_events_part
+                FOR VALUES FROM ('{m}') TO ('{_next_month(m)}')
+            """)
+        cursor.execute("""
+            CREATE TABLE email_events_default
+            PARTITION OF email_events_part DEFAULT
+        """)
+
+        cursor.execute("INSERT INTO email_events_part SELECT * FROM email_events")
+
+        # Local (per-partition) versions of the model's current indexes.
+        # No single-column lead_id index - (lead_id, event_type) covers
+        # those lookups.
+        cursor.execute("""
+            CREATE INDEX ON email_events_part (lead_id, event_type)
+        """)
+        cursor.execute("""
+            CREATE INDEX ON email_events_part (message_id, created_at)
+        """)
+        cursor.execute("""
+            CREATE INDEX ON email_events_part (client_id, created_at, event_type)
+        """)
+        cursor.execute("""
+            CREATE INDEX ON email_events_part (client_id, event_type, created_at)
+        """)
+        cursor.execute("CREATE INDEX ON email_events_part (client_id)")
+        cursor.execute("CREATE INDEX ON email_events_part (event_type)")
+        cursor.execute("CREATE INDEX ON email_events_part (message_id)")
+        cursor.execute("CREATE INDEX ON email_events_part (created_at)")
+        cursor.execute("""
+            CREATE INDEX ON email_events_part USING GIN (metadata jsonb_path_ops)
+        """)
+
+        # Re-attach the counter-maintenance trigger; row triggers on a
+        # partitioned parent clone onto every partition, present and
+        # future. The renamed old table keeps its own copy but no
+        # longer receives inserts.
+        cursor.execute("""
+            CREATE TRIGGER trg_email_events_seq_counters
+            AFTER INSERT ON email_events_part
+            FOR EACH ROW EXECUTE FUNCTION bump_campaign_sequence_counters()
+        """)
+
+        # email_event_bodies' FK would otherwise follow the rename and
+        # point at the dead table, rejecting every new body insert
+        cursor.execute("""
+            SELECT conname FROM pg_constraint
+            WHERE conrelid = 'email_event_bodies'::regclass
+            AND confrelid = 'email_events'::regclass
+            AND contype = 'f'
+        """)
+        for (conname,) in cursor.fetchall():
+            cursor.execute(
+                f"ALTER TABLE email_event_bodies DROP CONSTRAINT {conname}"
+            )
+
+        cursor.execute("ALTER TABLE email_events RENAME TO email_events_unpartitioned")
+        cursor.execute("ALTER TABLE email_events_part RENAME TO email_events")
+        for m in months:
+            cursor.execute(f"""
+                ALTER TABLE {_partition_name(m)}_new
+                RENAME TO {_partition_name(m)}
+            """)
+
+        # The reply dedupe unique can't live on the parent (it would
+        # have to include created_at) - one per partition instead, named
+        # after the final partition names
+        for m in months:
+            _ensure_reply_unique_index(cursor, _partition_name(m))
+        _ensure_reply_unique_index(cursor, 'email_events_default')
+
+        print("✅ email_events partitioned (old table kept as email_events_unpartitioned)")
+        print("   Drop it once the swap has been verified.")
+
+
+def ensure():
+    """Precreate current and next month's partitions"""
+    today = _month_start(date.today())
+    with connection.cursor() as cursor:
+        ensure_partitions(cursor, [today, _next_month(today)])
+
+
+if __name__ == '__main__':
+    if connection.vendor != 'postgresql':
+        print("❌ email_events partitioning requires PostgreSQL")
+        sys.exit(1)
+
+    command = sys.argv[1] if len(sys.argv) > 1 else 'ensure'
+    if command == 'convert':
+        convert()
+    elif command == 'ensure':
+        ensure()
+    else:
+        print(f"❌ Unknown command: {command} (expected 'convert' or 'ensure')")
+        sys.exit(1)
@@ -267,7 +267,10 @@ APIEOF
 # Supervisor - Celery Worker
 cat > /etc/supervisor/conf.d/oreestats-celery-worker.conf << WORKEREOF
 [program:oreestats-celery-worker]
-command=/home/$USERNAME/apps/oreestats/OreeStats/venv/bin/celery -A OreeStats worker --loglevel=info --concurrency=2
+; -P gevent on the CLI is required: only the CLI flag monkey-patches the
+; interpreter early enough (app.conf worker_pool alone leaves sockets
+; blocking), and --concurrency must match or it overrides the app config
+command=/home/$USERNAME/apps/oreestats/OreeStats/venv/bin/celery -A OreeStats worker -P gevent --concurrency=200 --loglevel=info
 directory=/home/$USERNAME/apps/oreestats/OreeStats
 user=$USERNAME
 autostart=true
@@ -301,6 +304,11 @@ supervisorctl start all
 ################################################################################
 echo -e "${GREEN}Configuring Nginx...${NC}"
 
+# 1x1 transparent PNG for the nginx-served tracking pixel (same bytes
+# as TrackingPixelGenerator.TRANSPARENT_PIXEL)
+mkdir -p $PROJECT_DIR/staticfiles
+echo 'iVBORw0KGgoAAAANSUhEUgAAAAEAAAABCAIAAACQd1PeAAAADElEQVR4nGMAAQAABQABDQottAAAAABJRU5ErkJggg==' | base64 -d > $PROJECT_DIR/staticfiles/pixel.png
+
 if [ -z "$DOMAIN" ]; then
     SERVER_NAME="_"
 else
@@ -315,7 +323,13 @@ upstream oreestats_api {
 server {
     listen 80;
     server_name $SERVER_NAME;
-    
+
+    # Mail clients fetch a pixel per message; keep the connection open
+    # so subsequent hits skip the TCP handshake. (No `http2 on;` here:
+    # the directive needs nginx >= 1.25.1, distro packages are older and
+    # would fail nginx -t, and h2c on plain :80 buys nothing anyway.)
+    keepalive_timeout 65;
+
     client_max_body_size 100M;
     
     access_log /var/log/nginx/oreestats-access.log;
@@ -326,6 +340,16 @@ server {
         expires 30d;
     }
 
+    # Tracking pixel fast path: nginx serves the 68-byte PNG itself and
+    # hands the open off to Django with a post-response subrequest, so
+    # the mail client never waits on the recording work
+    location ~ "^/api/track/open/(?<pixel_id>[A-Za-z0-9_-]+)\.png\$" {
+        alias /home/$USERNAME/apps/oreestats/OreeStats/staticfiles/pixel.png;
+        default_type image/png;
+        add_header Cache-Control "private, max-age=0, must-revalidate";
+        post_action /api/track/open-beacon/\$pixel_id;
+    }
+
     location /media/ {
         alias /home/$USERNAME/apps/oreestats/OreeStats/media/;
         expires 30d;